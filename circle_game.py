@@ -2,37 +2,121 @@
 #  IMPOSSIBLE DINOSAUR – SASSY, CHATTY, AND CORRECTLY NAMED
 # --------------------------------------------------------------
 #  • Image: purple_dinosaur.png
-#  • Speaks on EVERY left-click
+#  • Speaks on EVERY left-click (one speech engine, latest taunt wins)
 #  • No errors, no silent clicks
 # --------------------------------------------------------------
 
 import tkinter as tk
 from tkinter import messagebox
 import math
+import queue
 import random
+import statistics
+import sys
 import threading
+import time
 from pathlib import Path
 
-# ---------- TEXT-TO-SPEECH (per-click fresh engine) ----------
-def speak(text: str):
-    """Speak text using a new pyttsx3 engine in a background thread."""
-    def _run():
+# Shared scaled-image cache from the falling-words package next door
+PACKAGE_DIR = Path(__file__).resolve().parent / "falling_words_project"
+try:
+    from falling_words.image_cache import ImageCache, DEFAULT_CACHE_DIR, scaled_pil_image
+except ImportError:
+    ImageCache = None
+
+# ---------- TEXT-TO-SPEECH (one long-lived engine) ----------
+class SpeechWorker:
+    """Speak lines on a single pyttsx3 engine owned by a background thread.
+
+    At most `max_pending` lines wait; when clicks outrun speech the oldest
+    waiting line is dropped, and a line that waited longer than `stale_after`
+    seconds is skipped. Click-to-speech latency is kept for `report()`.
+    """
+
+    def __init__(self, max_pending: int = 1, stale_after: float = 3.0):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.stale_after = stale_after
+        self.latencies = []
+        self.dropped = 0
+        self.engine = None
+        self.current_requested = None
+        self.thread = threading.Thread(target=self._run, name="speech", daemon=True)
+        self.thread.start()
+
+    def say(self, text: str):
+        item = (time.perf_counter(), text)
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _init_engine(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        # Try to pick a sassy/female voice (only once, voices are slow to list)
+        for v in engine.getProperty('voices'):
+            if any(k in v.name.lower() for k in ('female', 'zira', 'karen', 'anna', 'samantha')):
+                engine.setProperty('voice', v.id)
+                break
+        engine.setProperty('rate', 170)
+        engine.setProperty('volume', 0.9)
+        engine.connect('started-utterance', self._on_start)
+        return engine
+
+    def _on_start(self, name):
+        if self.current_requested is not None:
+            self.latencies.append(time.perf_counter() - self.current_requested)
+            self.current_requested = None
+
+    def _run(self):
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            # Try to pick a sassy/female voice
-            for v in engine.getProperty('voices'):
-                if any(k in v.name.lower() for k in ('female', 'zira', 'karen', 'anna', 'samantha')):
-                    engine.setProperty('voice', v.id)
-                    break
-            engine.setProperty('rate', 170)
-            engine.setProperty('volume', 0.9)
-            engine.say(text)
-            engine.runAndWait()
+            self.engine = self._init_engine()
         except Exception as e:
             print(f"[TTS Error] {e}")
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            requested, text = item
+            if time.perf_counter() - requested > self.stale_after:
+                self.dropped += 1
+                continue
+            if self.engine is None:
+                continue
+            try:
+                self.current_requested = requested
+                self.engine.say(text)
+                self.engine.runAndWait()
+            except Exception as e:
+                print(f"[TTS Error] {e}")
+
+    def close(self, timeout: float = 5.0):
+        """Let the line being spoken (and one waiting line) finish, then stop."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                self.queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                if time.perf_counter() > deadline:
+                    break
+        # A daemon thread: if it is still talking after this, exit cuts it off
+        self.thread.join(max(0.0, deadline - time.perf_counter()))
+        self.report()
 
-    threading.Thread(target=_run, daemon=True).start()
+    def report(self):
+        if not self.latencies:
+            print(f"[TTS] nothing spoken, {self.dropped} lines dropped")
+            return
+        ms = sorted(l * 1000 for l in self.latencies)
+        print(f"[TTS] {len(ms)} lines, click-to-speech median {statistics.median(ms):.0f} ms, "
+              f"max {ms[-1]:.0f} ms, {self.dropped} dropped")
 
 
 # ---------- SASSY TAUNTS ----------
@@ -51,18 +135,25 @@ SASSY_LINES = [
 
 # ---------- GAME CLASS ----------
 class ImpossibleDinosaurGame:
-    def __init__(self, root):
+    def __init__(self, root, tick_ms: int = 16):
         self.root = root
         self.root.title("Impossible Dinosaur – Sassy Edition")
+        self.speech = SpeechWorker()
 
         self.canvas = tk.Canvas(root, width=600, height=400, bg="white")
         self.canvas.pack()
 
-        # ----- LOAD IMAGE: purple_dinosaur.png -----
+        # ----- LOAD IMAGE: purple_dinosaur.png (here, or the falling-words assets) -----
         img_path = Path("purple_dinosaur.png")
+        if not img_path.exists():
+            img_path = PACKAGE_DIR / "falling_words" / "assets" / "purple_dinosaur.png"
         try:
             from PIL import Image, ImageTk
-            img = Image.open(img_path).resize((40, 40), Image.Resampling.LANCZOS)
+            if ImageCache is not None:
+                # Decoded and resized once, then reused from the cache on later launches
+                img = scaled_pil_image(ImageCache(DEFAULT_CACHE_DIR), str(img_path), (40, 40))
+            else:
+                img = Image.open(img_path).resize((40, 40), Image.Resampling.LANCZOS)
             self.dino_photo = ImageTk.PhotoImage(img)
             self.is_image = True
         except Exception as e:
@@ -74,18 +165,6 @@ class ImpossibleDinosaurGame:
         self.x = 300
         self.y = 200
 
-        # Create canvas item
-        if self.is_image:
-            self.dino_item = self.canvas.create_image(
-                self.x, self.y, image=self.dino_photo, anchor="center"
-            )
-        else:
-            self.dino_item = self.canvas.create_oval(
-                self.x - self.radius, self.y - self.radius,
-                self.x + self.radius, self.y + self.radius,
-                fill="purple"
-            )
-
         # Game settings
         self.movement_enabled = True
         self.avoid_dist = 100
@@ -94,10 +173,31 @@ class ImpossibleDinosaurGame:
         self.h = 400
         self.right_clicks = 0
 
+        self._create_dinos()
+
+        # Motion events only store the cursor; the flee step runs once per tick
+        self.tick_ms = tick_ms
+        self.pending_mouse = None
+
         # Bindings
         self.canvas.bind("<Motion>", self._move)
         self.canvas.bind("<Button-1>", self._left_click)
         self.canvas.bind("<Button-3>", self._right_click)
+        self.root.after(self.tick_ms, self._tick)
+
+    # ------------------------------------------------------------------
+    def _create_dinos(self):
+        """Create canvas item"""
+        if self.is_image:
+            self.dino_item = self.canvas.create_image(
+                self.x, self.y, image=self.dino_photo, anchor="center"
+            )
+        else:
+            self.dino_item = self.canvas.create_oval(
+                self.x - self.radius, self.y - self.radius,
+                self.x + self.radius, self.y + self.radius,
+                fill="purple"
+            )
 
     # ------------------------------------------------------------------
     def _update_position(self):
@@ -113,10 +213,20 @@ class ImpossibleDinosaurGame:
 
     # ------------------------------------------------------------------
     def _move(self, event):
-        if not self.movement_enabled:
-            return
+        # Mice can report hundreds of times a second: just keep the latest
+        self.pending_mouse = (event.x, event.y)
+
+    # ------------------------------------------------------------------
+    def _tick(self):
+        if self.pending_mouse is not None:
+            mx, my = self.pending_mouse
+            self.pending_mouse = None
+            if self.movement_enabled:
+                self._flee(mx, my)
+        self.root.after(self.tick_ms, self._tick)
 
-        mx, my = event.x, event.y
+    # ------------------------------------------------------------------
+    def _flee(self, mx, my):
         dist = math.hypot(mx - self.x, my - self.y)
 
         if dist < self.avoid_dist:
@@ -150,18 +260,21 @@ class ImpossibleDinosaurGame:
             self._update_position()
 
     # ------------------------------------------------------------------
-    def _left_click(self, event):
-        dist = math.hypot(event.x - self.x, event.y - self.y)
+    def _hit(self, x, y):
+        return math.hypot(x - self.x, y - self.y) <= self.radius
 
-        if dist <= self.radius:
+    # ------------------------------------------------------------------
+    def _left_click(self, event):
+        if self._hit(event.x, event.y):
             msg = "You caught the dinosaur! You win!"
+            # Speak first so the voice starts while the dialog is up
+            self.speech.say("Yay! You finally got me. Good job, human!")
             messagebox.showinfo("Win!", msg)
-            speak("Yay! You finally got me. Good job, human!")
             self.root.quit()
         else:
             msg = random.choice(SASSY_LINES)
+            self.speech.say(msg)  # SPEAKS EVERY TIME (latest taunt wins)
             messagebox.showinfo("Missed!", msg)
-            speak(msg)  # SPEAKS EVERY TIME
 
     # ------------------------------------------------------------------
     def _right_click(self, event):
@@ -174,11 +287,116 @@ class ImpossibleDinosaurGame:
             # speak(f"Movement {status}!")
             s = f"This doesn't seem like a good game for you ... how about I just stay still?"
             print(s)
-            speak(s)
+            self.speech.say(s)
+
+
+# ---------- SWARM MODE ----------
+class DinosaurSwarmGame(ImpossibleDinosaurGame):
+    """Many dinosaurs, each fleeing the cursor, computed as NumPy arrays.
+
+    Flee vectors, the speed step, boundary teleports and the click hit test
+    are one batched pass over all dinosaurs per tick; only dinosaurs that
+    actually moved get a canvas update.
+    """
+
+    def __init__(self, root, count: int, tick_ms: int = 16, seed=None):
+        import numpy as np
+
+        self.np = np
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+        super().__init__(root, tick_ms=tick_ms)
+        self.root.title(f"Impossible Dinosaurs – {count} of them")
+
+    # ------------------------------------------------------------------
+    def _create_dinos(self):
+        np, r = self.np, self.radius
+        self.xs = self.rng.uniform(r, self.w - r, self.count)
+        self.ys = self.rng.uniform(r, self.h - r, self.count)
+        if self.is_image:
+            self.dino_items = [
+                self.canvas.create_image(x, y, image=self.dino_photo, anchor="center")
+                for x, y in zip(self.xs.tolist(), self.ys.tolist())
+            ]
+        else:
+            self.dino_items = [
+                self.canvas.create_oval(x - r, y - r, x + r, y + r, fill="purple")
+                for x, y in zip(self.xs.tolist(), self.ys.tolist())
+            ]
+        self.dino_items = np.array(self.dino_items)
+
+    # ------------------------------------------------------------------
+    def _teleport(self, mask, x_low, x_high, y_low, y_high):
+        n = int(mask.sum())
+        if n:
+            self.xs[mask] = self.rng.integers(x_low, x_high, n, endpoint=True)
+            self.ys[mask] = self.rng.integers(y_low, y_high, n, endpoint=True)
+
+    def _flee(self, mx, my):
+        np, r = self.np, self.radius
+        dx = self.xs - mx
+        dy = self.ys - my
+        dist = np.hypot(dx, dy)
+        fleeing = dist < self.avoid_dist
+        if not fleeing.any():
+            return
+
+        # Same rules as the single dinosaur, for every fleeing one at once
+        norm = np.where(dist > 0, dist, 1.0)
+        self.xs[fleeing] += (dx / norm * self.speed)[fleeing]
+        self.ys[fleeing] += (dy / norm * self.speed)[fleeing]
+
+        half_w, half_h = self.w // 2, self.h // 2
+        left = fleeing & (self.xs < r)
+        right = fleeing & (self.xs > self.w - r)
+        self._teleport(left, half_w, self.w - r, r, self.h - r)
+        self._teleport(right, r, half_w, r, self.h - r)
+        top = fleeing & (self.ys < r)
+        bottom = fleeing & (self.ys > self.h - r)
+        self._teleport(top, r, self.w - r, half_h, self.h - r)
+        self._teleport(bottom, r, self.w - r, r, half_h)
+
+        self._update_positions(np.flatnonzero(fleeing))
+
+    # ------------------------------------------------------------------
+    def _update_positions(self, indices):
+        r = self.radius
+        coords = self.canvas.coords
+        items = self.dino_items[indices].tolist()
+        xs = self.xs[indices].tolist()
+        ys = self.ys[indices].tolist()
+        if self.is_image:
+            for item, x, y in zip(items, xs, ys):
+                coords(item, x, y)
+        else:
+            for item, x, y in zip(items, xs, ys):
+                coords(item, x - r, y - r, x + r, y + r)
+
+    # ------------------------------------------------------------------
+    def _hit(self, x, y):
+        dist = self.np.hypot(self.xs - x, self.ys - y)
+        return bool(dist[dist.argmin()] <= self.radius)
 
 
 # ----------------------------------------------------------------------
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Catch the impossible dinosaur.")
+    parser.add_argument("--tick-ms", type=int, default=16,
+                        help="milliseconds between movement updates (default 16, about 60 Hz)")
+    parser.add_argument("--swarm", type=int, default=0, metavar="N",
+                        help="play against N dinosaurs instead of one (needs NumPy)")
+    args = parser.parse_args()
+
+    # Not installed (pip install -e falling_words_project): use the checkout next door
+    if ImageCache is None:
+        sys.path.insert(0, str(PACKAGE_DIR))
+        try:
+            from falling_words.image_cache import ImageCache, DEFAULT_CACHE_DIR, scaled_pil_image
+        except ImportError:
+            pass
+
     # Check for missing packages
     missing = []
     for mod in ("Pillow", "pyttsx3"):
@@ -191,5 +409,13 @@ if __name__ == "__main__":
         print("Run: pip install " + " ".join(missing))
 
     root = tk.Tk()
-    game = ImpossibleDinosaurGame(root)
-    root.mainloop()
\ No newline at end of file
+    game = None
+    if args.swarm > 0:
+        try:
+            game = DinosaurSwarmGame(root, args.swarm, tick_ms=args.tick_ms)
+        except ImportError:
+            print("Swarm mode needs NumPy (pip install numpy); playing with one dinosaur.")
+    if game is None:
+        game = ImpossibleDinosaurGame(root, tick_ms=args.tick_ms)
+    root.mainloop()
+    game.speech.close()
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""Headless benchmarks for the game's hot paths.
+
+Run from falling_words_project/:
+
+    python -m benchmarks.bench                   # report, compare to baseline
+    python -m benchmarks.bench --save-baseline   # record this machine's baseline
+    python -m benchmarks.bench -k sprites        # only benchmarks matching "sprites"
+
+Exits with status 1 when a benchmark is slower than its baseline by more than
+--threshold. Baselines are machine specific, so each machine keeps its own.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Must be set before pygame initializes its display and mixer.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from loguru import logger
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+# A few real levels, so game benchmarks don't run on the missing-config fallback.
+WORDS_FIXTURE = os.path.join(BENCH_DIR, "words_config.json")
+DEFAULT_THRESHOLD = 0.25
+ROUNDS = 5
+ROUND_SECONDS = 0.2
+SPRITE_COUNTS = (5, 200, 500)
+LARGE_LEVEL_WORDS = 200_000
+WARMUP_TICKS = 1000
+
+BENCHMARKS = []
+
+def benchmark(name):
+    """Register ``setup(workdir, cleanup) -> op``; op() is one timed operation.
+
+    Setups append anything that must be closed before workdir goes to cleanup.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+def measure(op, rounds=ROUNDS, round_seconds=ROUND_SECONDS):
+    # Calibrate a loop count that fills a round, then keep the fastest round:
+    # the minimum is the least disturbed by the rest of the machine.
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= round_seconds / 10:
+            break
+        loops *= 2
+    loops = max(1, int(loops * round_seconds / max(elapsed, 1e-9)))
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            op()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+def make_game(workdir, cleanup, **kwargs):
+    from falling_words import game
+
+    game.setup()
+    # Copied so the compiled corpus lands in workdir, not next to the fixture.
+    word_config = os.path.join(workdir, "words_config.json")
+    if not os.path.exists(word_config):
+        shutil.copyfile(WORDS_FIXTURE, word_config)
+    g = game.Game(score_file=os.path.join(workdir, "highscores.json"), word_config=word_config, **kwargs)
+    cleanup.append(g.score_manager.close)
+    cleanup.append(g.word_manager.close)
+    g.sprite_manager.enabled = False
+    # Mid-game, once words have piled up and some were missed, is the
+    # expensive case; it takes over 15 s of play to get there.
+    for _ in range(WARMUP_TICKS):
+        g.update()
+    return g
+
+def keep_playing(g):
+    if g.sim.finished:
+        g.reset_game()
+
+@benchmark("game.update")
+def bench_game_update(workdir, cleanup):
+    g = make_game(workdir, cleanup)
+
+    def op():
+        g.update()
+        keep_playing(g)
+    return op
+
+@benchmark("game.draw[flip]")
+def bench_game_draw_flip(workdir, cleanup):
+    g = make_game(workdir, cleanup, render_mode="flip")
+    return lambda: g.draw(0.5)
+
+@benchmark("game.draw[dirty]")
+def bench_game_draw_dirty(workdir, cleanup):
+    g = make_game(workdir, cleanup, render_mode="dirty")
+    return lambda: g.draw(0.5)
+
+def make_sprites(count):
+    from falling_words import game
+    from falling_words.sprite_manager import SpriteManager
+
+    game.setup()
+    # Up to 5 sprites is the regular pool; more needs the NumPy swarm.
+    swarm_size = count if count > 5 else 0
+    manager = SpriteManager(game.WIDTH, game.HEIGHT, swarm_size=swarm_size)
+    manager.max_sprites = count
+    manager.spawn_chance = 1.0
+    manager.wait_for_assets()
+    if swarm_size and manager.swarm is None:
+        return None
+    for _ in range(600):
+        manager.update()
+    return manager
+
+def register_sprite_benchmarks(count):
+    @benchmark(f"sprites.update[{count}]")
+    def bench_update(workdir, cleanup):
+        manager = make_sprites(count)
+        return manager and manager.update
+
+    @benchmark(f"sprites.draw[{count}]")
+    def bench_draw(workdir, cleanup):
+        from falling_words import game
+
+        manager = make_sprites(count)
+        return manager and (lambda: manager.draw(game.screen, 0.5))
+
+for sprite_count in SPRITE_COUNTS:
+    register_sprite_benchmarks(sprite_count)
+
+def make_word_manager(workdir, cleanup, use_corpus):
+    from falling_words.word_manager import WordManager
+
+    config_path = os.path.join(workdir, "large_words.json")
+    if not os.path.exists(config_path):
+        rng = random.Random(1)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 14)))
+                 for _ in range(LARGE_LEVEL_WORDS)]
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"levels": {"large": words}, "default_level": "large"}, f)
+    manager = WordManager(config_path, use_corpus=use_corpus)
+    if manager.corpus is not None:
+        cleanup.append(manager.corpus.close)
+    return manager
+
+@benchmark("words.get_word[corpus]")
+def bench_get_word_corpus(workdir, cleanup):
+    return make_word_manager(workdir, cleanup, True).get_word
+
+@benchmark("words.get_word[corpus,5-8]")
+def bench_get_word_corpus_range(workdir, cleanup):
+    manager = make_word_manager(workdir, cleanup, True)
+    return lambda: manager.get_word(min_length=5, max_length=8)
+
+@benchmark("words.get_word[json,5-8]")
+def bench_get_word_json_range(workdir, cleanup):
+    manager = make_word_manager(workdir, cleanup, False)
+    return lambda: manager.get_word(min_length=5, max_length=8)
+
+@benchmark("scores.update_score")
+def bench_update_score(workdir, cleanup):
+    from falling_words.score_manager import ScoreManager
+
+    manager = ScoreManager(os.path.join(workdir, "scores.json"))
+    cleanup.append(manager.close)
+    manager.update_score("large", "BEGINNER", 100.0, 30)
+    # The common case: a finished game that does not beat the record. New
+    # records only queue a write, which the writer thread does off the clock
+    # but would make the measurement depend on disk speed.
+    return lambda: manager.update_score("large", "BEGINNER", 80.0, 10)
+
+@benchmark("telemetry.record")
+def bench_telemetry_record(workdir, cleanup):
+    from falling_words.telemetry import KeystrokeTelemetry, KEY
+
+    # The game's own ring size. A timed loop types far faster than anyone, so
+    # the flusher drops most records; record() itself does the same work
+    # either way, and the flusher copies at most one ring per flush, as in
+    # the game.
+    telemetry = KeystrokeTelemetry(os.path.join(workdir, "telemetry"))
+
+    def close():
+        # Its warning about dropped records does not apply here.
+        logger.disable("falling_words.telemetry")
+        telemetry.close()
+        logger.enable("falling_words.telemetry")
+        if telemetry.dropped:
+            print(f"telemetry.record: the flusher kept {telemetry.head - telemetry.dropped:,} "
+                  f"of {telemetry.head:,} records, as expected at this rate")
+
+    cleanup.append(close)
+    telemetry.start_session("large", "BEGINNER")
+    # The flusher runs alongside, as it does in the game.
+    return lambda: telemetry.record(KEY, 97)
+
+def run(selected):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="falling-words-bench-") as workdir:
+        cleanup = []
+        try:
+            for name, setup in BENCHMARKS:
+                if selected and not any(s in name for s in selected):
+                    continue
+                op = setup(workdir, cleanup)
+                if op is None:
+                    print(f"{name:<32}skipped (needs NumPy)")
+                    continue
+                seconds = measure(op)
+                results[name] = seconds
+                print(f"{name:<32}{1 / seconds:14,.0f} ops/s{seconds * 1e6:12.2f} us/op"
+                      f"{seconds * 60 * 100:9.2f}% of a 60 fps frame")
+        finally:
+            for close in cleanup:
+                close()
+    return results
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        change = seconds / baseline[name] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32}{change * 100:+8.1f}% vs baseline{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="selected", action="append", default=[],
+                        help="only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write these results into the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before failing, as a fraction (default 0.25)")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    results = run(args.selected)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+    print()
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,7 @@
-from .game import main
 __version__ = "3.1.0"
+
+def main(argv=None):
+    # Imported lazily so the display-free modules (e.g. simulation) can be
+    # used without opening a window.
+    from .game import main as game_main
+    return game_main(argv)
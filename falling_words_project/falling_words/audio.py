@@ -0,0 +1,117 @@
+import math
+import threading
+import time
+from array import array
+
+import pygame
+from loguru import logger
+
+from .startup import startup
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# name: (frequency in Hz, duration in ms) -- the tones the game used to winsound.Beep
+TONES = {
+    "correct": (880, 150),
+    "incorrect": (220, 200),
+    "victory": (784, 3000),
+    "game_over_good": (523, 3000),
+    "game_over_bad": (196, 1000),
+}
+
+class AudioEngine:
+    """Plays the game's tones on pygame mixer channels without blocking.
+
+    ``open`` opens the mixer and must run on the main thread, as SDL expects.
+    ``start`` then synthesizes every tone once into a ``pygame.mixer.Sound``
+    on a background thread, so that never lands on a keystroke; ``play``
+    drops tones until it is done. At most ``voices`` tones sound at once (the
+    oldest is cut off), and a tone repeated within ``coalesce_ms`` is dropped.
+    """
+
+    def __init__(self, voices=4, coalesce_ms=60, volume=0.3, sample_rate=22050):
+        self.voices = voices
+        self.coalesce_ms = coalesce_ms
+        self.volume = volume
+        self.sample_rate = sample_rate
+        self.sounds = {}
+        self.last_played = {}
+        self.opened = False
+        self.available = False
+        self.ready = threading.Event()
+        self.loader = None
+
+    def open(self):
+        if self.opened:
+            return
+        try:
+            with startup.phase("mixer"):
+                pygame.mixer.init(frequency=self.sample_rate, size=-16, channels=1, buffer=512)
+                pygame.mixer.set_num_channels(self.voices)
+            self.opened = True
+        except pygame.error as e:
+            logger.warning(f"Audio unavailable, sound disabled: {e}")
+
+    def start(self):
+        if self.loader is None:
+            self.loader = threading.Thread(target=self._load, name="audio-tones", daemon=True)
+            self.loader.start()
+
+    def _load(self):
+        try:
+            # Without an open mixer there is nothing to play the tones on.
+            if self.opened:
+                with startup.phase("tones"):
+                    for name, (frequency, duration) in TONES.items():
+                        self.sounds[name] = self.synthesize(frequency, duration)
+                self.available = True
+        except pygame.error as e:
+            logger.warning(f"Audio unavailable, sound disabled: {e}")
+        finally:
+            self.ready.set()
+
+    def synthesize(self, frequency, duration_ms):
+        rate, size, channels = pygame.mixer.get_init()
+        count = int(rate * duration_ms / 1000)
+        fade = min(count // 2, int(rate * 0.005))  # 5 ms ramps avoid clicks
+        amplitude = 32767 * self.volume
+        if np is not None:
+            t = np.arange(count) / rate
+            wave = np.sin(2 * np.pi * frequency * t) * amplitude
+            if fade:
+                ramp = np.linspace(0.0, 1.0, fade)
+                wave[:fade] *= ramp
+                wave[-fade:] *= ramp[::-1]
+            samples = np.repeat(wave.astype(np.int16), channels)
+            return pygame.mixer.Sound(buffer=samples.tobytes())
+
+        samples = array("h")
+        step = 2 * math.pi * frequency / rate
+        for i in range(count):
+            envelope = min(1.0, i / fade, (count - 1 - i) / fade) if fade else 1.0
+            value = int(math.sin(step * i) * amplitude * envelope)
+            samples.extend([value] * channels)
+        return pygame.mixer.Sound(buffer=samples.tobytes())
+
+    def play(self, name):
+        if not self.ready.is_set():
+            self.start()
+            return
+        if not self.available:
+            return
+        now = time.perf_counter() * 1000
+        if now - self.last_played.get(name, -self.coalesce_ms) < self.coalesce_ms:
+            return
+        self.last_played[name] = now
+        channel = pygame.mixer.find_channel(True)
+        if channel is not None:
+            channel.play(self.sounds[name])
+
+    def stop(self):
+        if self.loader is not None:
+            self.loader.join()
+        if self.available:
+            pygame.mixer.stop()
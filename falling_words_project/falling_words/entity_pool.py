@@ -0,0 +1,41 @@
+class EntityPool:
+    """Dense list of live entities with O(1) swap-removal and object recycling.
+
+    Entities need a ``reset(*args)`` method (called on every acquire) and a
+    ``pool_index`` slot. Removal moves the last entity into the freed slot, so
+    iteration order is not spawn order; walk ``items`` backwards when releasing
+    during a loop.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.items = []
+        self.free = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def acquire(self, *args):
+        entity = self.free.pop() if self.free else self.factory()
+        entity.reset(*args)
+        entity.pool_index = len(self.items)
+        self.items.append(entity)
+        return entity
+
+    def release(self, entity):
+        index = entity.pool_index
+        last = self.items.pop()
+        if last is not entity:
+            self.items[index] = last
+            last.pool_index = index
+        entity.pool_index = -1
+        self.free.append(entity)
+
+    def clear(self):
+        for entity in self.items:
+            entity.pool_index = -1
+        self.free.extend(self.items)
+        self.items.clear()
@@ -1,38 +1,33 @@
+import argparse
+import os
 import pygame
 import random
 import sys
-import platform
-import winsound 
+import time
 from loguru import logger
 
 from .word_manager import WordManager
 from .sprite_manager import SpriteManager
-from .score_manager import ScoreManager
-
-TOTAL_WORDS = 30           
-SPEED_INCREASE_PER_WORD = 0.02  
-MAX_WORDS_ON_SCREEN = 10   
-INITIAL_WORDS = 1          
-WORD_SPAWN_DELAY = 2.0     
-BACKSPACE_DELAY = 150      
-BACKSPACE_INTERVAL = 50    
-
-MIN_WORD_LENGTH = 3
-DECELERATION_RATE = 1.0
-NUMBER_OF_WORDS_BEFORE_LAG = 4
-LAG = 5  
-
-DIFFICULTY_SETTINGS = {
-    "BEGINNER": 1.0,
-    "STANDARD": 1.5,
-    "EXPERT": 2.0
-}
-
-pygame.init()
-pygame.mixer.init()
+from .image_cache import DEFAULT_CACHE_DIR
+from .score_manager import ScoreManager, STORAGE_ENGINES
+from .text_cache import TextCache
+from .entity_pool import EntityPool
+from .startup import startup
+from .audio import AudioEngine
+from .profiler import FrameProfiler
+from .replay import SessionRecorder, Replay
+from .retained import RetainedSurface, layer
+from .telemetry import KeystrokeTelemetry, KEY, BACKSPACE, HIT, MISS, CLEAR, END
+from .simulation import (
+    Simulation, ManualClock, DIFFICULTY_SETTINGS, TOTAL_WORDS, SPEED_INCREASE_PER_WORD, TICK_MS
+)
 
 WIDTH, HEIGHT = 900, 650
 FPS = 60
+MAX_TICKS_PER_FRAME = 5
+RENDER_MODES = ("flip", "dirty")
+TEXT_CACHE_SIZE = 256
+END_EVENTS = ("victory", "game_over_good", "game_over_bad")
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -47,47 +42,80 @@ DARK_RED = (150, 0, 0)
 DARK_BLUE = (0, 0, 150)
 GOLD = (255, 215, 0)
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Modular Falling Words")
-clock = pygame.time.Clock()
-font = pygame.font.Font(None, 48)
-small_font = pygame.font.Font(None, 32)
-big_font = pygame.font.Font(None, 72)
-button_font = pygame.font.Font(None, 36)
+class LazyFont:
+    def __init__(self, size):
+        self.size = size
+        self.font = None
 
-def play_correct():
-    if platform.system() == "Windows": winsound.Beep(880, 150)
+    def __getattr__(self, name):
+        # Only reached for attributes LazyFont lacks, i.e. the pygame.font.Font API.
+        if self.font is None:
+            with startup.phase(f"font {self.size}px"):
+                self.font = pygame.font.Font(None, self.size)
+        return getattr(self.font, name)
 
-def play_incorrect():
-    if platform.system() == "Windows": winsound.Beep(220, 200)
+screen = None
+clock = None
+font = LazyFont(48)
+small_font = LazyFont(32)
+big_font = LazyFont(72)
+button_font = LazyFont(36)
+profiler_font = LazyFont(20)
+text_cache = TextCache(max_entries=TEXT_CACHE_SIZE)
+audio = AudioEngine()
 
-def play_victory():
-    if platform.system() == "Windows": winsound.Beep(784, 3000)
+def setup():
+    global screen, clock
+    if screen is not None:
+        return screen
+    # Only the subsystems the game uses; the tones are synthesized on their own thread in main().
+    with startup.phase("pygame init"):
+        pygame.display.init()
+        pygame.font.init()
+    with startup.phase("display"):
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Modular Falling Words")
+        clock = pygame.time.Clock()
+    # Here, on the main thread: some SDL audio backends fail when opened from another.
+    audio.open()
+    return screen
 
-def play_game_over_good():
-    if platform.system() == "Windows": winsound.Beep(523, 3000)
-
-def play_game_over_bad():
-    if platform.system() == "Windows": winsound.Beep(196, 1000)
+def get_ticks():
+    # pygame.time.get_ticks() reads 0 until pygame.init() starts the SDL timer,
+    # which setup() deliberately skips.
+    return time.perf_counter() * 1000
 
 class FloatingText:
-    def __init__(self, x, y, text, color):
+    __slots__ = ("x", "y", "prev_y", "text", "color", "alpha", "speed", "pool_index")
+
+    def __init__(self, x=0, y=0, text="", color=WHITE):
+        self.pool_index = -1
+        self.reset(x, y, text, color)
+
+    def reset(self, x, y, text, color):
         self.x = x
         self.y = y
         self.text = text
         self.color = color
         self.alpha = 255
         self.speed = 2
+        self.prev_y = y
         
     def update(self):
+        self.prev_y = self.y
         self.y -= self.speed
         self.alpha -= 5
         
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
         if self.alpha > 0:
-            text_surf = small_font.render(self.text, True, self.color)
+            y = self.prev_y + (self.y - self.prev_y) * alpha
+            text_surf = text_cache.render(small_font, self.text, True, self.color)
+            # Cached surfaces are shared, so reset the alpha after blitting.
             text_surf.set_alpha(max(0, self.alpha))
-            surface.blit(text_surf, (self.x, self.y))
+            rect = surface.blit(text_surf, (self.x, y))
+            text_surf.set_alpha(None)
+            return rect
+        return pygame.Rect(self.x, self.y, 0, 0)
 
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color):
@@ -96,16 +124,23 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.current_color = color
+        self.view = RetainedSurface(self.build)
     
-    def draw(self, surface):
+    def build(self, text, color):
         shadow_rect = self.rect.copy()
         shadow_rect.y += 4
-        pygame.draw.rect(surface, (50, 50, 50), shadow_rect, border_radius=8)
-        pygame.draw.rect(surface, self.current_color, self.rect, border_radius=8)
-        pygame.draw.rect(surface, WHITE, self.rect, 2, border_radius=8)
-        text_surface = button_font.render(self.text, True, WHITE)
+        text_surface = text_cache.render(button_font, text, True, WHITE)
         text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+        bounds = self.rect.union(shadow_rect).union(text_rect)
+        surface, offset = layer(bounds)
+        pygame.draw.rect(surface, (50, 50, 50), shadow_rect.move(offset), border_radius=8)
+        pygame.draw.rect(surface, color, self.rect.move(offset), border_radius=8)
+        pygame.draw.rect(surface, WHITE, self.rect.move(offset), 2, border_radius=8)
+        surface.blit(text_surface, text_rect.move(offset))
+        return surface, bounds
+    
+    def draw(self, surface):
+        return self.view.draw(surface, self.text, self.current_color)
     
     def update(self, mouse_pos):
         self.current_color = self.hover_color if self.rect.collidepoint(mouse_pos) else self.color
@@ -122,32 +157,47 @@ class Dropdown:
         self.color = (180, 100, 0)
         self.hover_color = ORANGE
         self.current_color = self.color
-        
+        self.view = RetainedSurface(self.build)
+        self.set_options(options, selected_index)
+
+    def set_options(self, options, selected_index=0):
+        self.options = options
+        self.selected_index = selected_index
+        x, y, width, height = self.rect
         self.open_rects = []
         for i in range(len(options)):
             self.open_rects.append(pygame.Rect(x, y + (i + 1) * height, width, height))
+        self.view.invalidate()
             
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.current_color, self.rect, border_radius=4)
-        pygame.draw.rect(surface, WHITE, self.rect, 2, border_radius=4)
+    def build(self, selected_index, color, is_open):
+        bounds = self.rect.unionall(self.open_rects) if is_open else self.rect.copy()
+        surface, offset = layer(bounds)
+        rect = self.rect.move(offset)
+        pygame.draw.rect(surface, color, rect, border_radius=4)
+        pygame.draw.rect(surface, WHITE, rect, 2, border_radius=4)
         
-        indicator_x = self.rect.right - 20
-        indicator_y = self.rect.centery
-        if self.is_open:
+        indicator_x = rect.right - 20
+        indicator_y = rect.centery
+        if is_open:
             pygame.draw.polygon(surface, WHITE, [(indicator_x-6, indicator_y+4), (indicator_x+6, indicator_y+4), (indicator_x, indicator_y-4)])
         else:
             pygame.draw.polygon(surface, WHITE, [(indicator_x-6, indicator_y-4), (indicator_x+6, indicator_y-4), (indicator_x, indicator_y+4)])
             
-        text_surf = small_font.render(f"{self.options[self.selected_index]}", True, WHITE)
-        text_rect = text_surf.get_rect(center=(self.rect.centerx - 10, self.rect.centery))
+        text_surf = text_cache.render(small_font, f"{self.options[selected_index]}", True, WHITE)
+        text_rect = text_surf.get_rect(center=(rect.centerx - 10, rect.centery))
         surface.blit(text_surf, text_rect)
         
-        if self.is_open:
+        if is_open:
             for i, opt_rect in enumerate(self.open_rects):
+                opt_rect = opt_rect.move(offset)
                 pygame.draw.rect(surface, (150, 80, 0), opt_rect)
                 pygame.draw.rect(surface, WHITE, opt_rect, 1)
-                opt_text = small_font.render(self.options[i], True, WHITE)
+                opt_text = text_cache.render(small_font, self.options[i], True, WHITE)
                 surface.blit(opt_text, opt_text.get_rect(center=opt_rect.center))
+        return surface, bounds
+    
+    def draw(self, surface):
+        return self.view.draw(surface, self.selected_index, self.current_color, self.is_open)
                 
     def update(self, mouse_pos):
         self.current_color = self.hover_color if self.rect.collidepoint(mouse_pos) else self.color
@@ -168,36 +218,50 @@ class Dropdown:
                     return "OPENED"
         return None
 
-class Word:
-    def __init__(self, x, y, text, speed):
-        self.x = x
-        self.y = y
-        self.text = text
-        self.speed = speed
-        self.color = WHITE
-    
-    def update(self):
-        self.y += self.speed
-    
-    def draw(self, surface):
-        word_surface = font.render(self.text, True, self.color)
-        surface.blit(word_surface, (self.x, self.y))
-    
-    def is_off_screen(self):
-        return self.y > HEIGHT - 100
+def draw_word(surface, word, typed=0, alpha=1.0):
+    y = word.draw_y(alpha)
+    if not typed:
+        word_surface = text_cache.render(font, word.text, True, WHITE)
+        return surface.blit(word_surface, (word.x, y))
+    # Candidate for the current input: typed prefix in green, the rest in yellow.
+    prefix_surface = text_cache.render(font, word.text[:typed], True, GREEN)
+    rest_surface = text_cache.render(font, word.text[typed:], True, YELLOW)
+    rect = surface.blit(prefix_surface, (word.x, y))
+    return rect.union(surface.blit(rest_surface, (word.x + prefix_surface.get_width(), y)))
 
 class Game:
-    def __init__(self):
-        self.word_manager = WordManager()
-        self.sprite_manager = SpriteManager(width=WIDTH, height=HEIGHT, enabled=True)
-        self.score_manager = ScoreManager()
+    def __init__(self, render_mode="flip", fx_storm=0, score_storage="json", player="player", profiler=None,
+                 score_file="highscores.json", telemetry=None, image_cache_dir=None,
+                 word_config="words_config.json"):
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode '{render_mode}', expected one of {RENDER_MODES}")
+        self.render_mode = render_mode
+        setup()
+        self.background = self.build_background()
+        self.profiler = profiler or FrameProfiler()
+        self.telemetry = telemetry or KeystrokeTelemetry(directory=None)
+        self.previous_rects = []
+        self.force_full_redraw = True
+        with startup.phase("word config"):
+            self.word_manager = WordManager(word_config)
+        self.sprite_manager = SpriteManager(width=WIDTH, height=HEIGHT, enabled=True, swarm_size=fx_storm,
+                                            image_cache_dir=image_cache_dir)
+        self.score_manager = ScoreManager(score_file, storage=score_storage, player=player)
+        self.difficulties = list(DIFFICULTY_SETTINGS.keys())
+        self.difficulty_index = 0
+        # The simulation runs on its own clock, advanced one fixed tick per update().
+        self.sim_clock = ManualClock()
+        self.ticks = 0
+        self.floating_texts = EntityPool(FloatingText)
+        self.sim = Simulation(
+            self.word_manager, WIDTH, HEIGHT, clock=self.sim_clock,
+            score_manager=self.score_manager, difficulty=self.difficulties[self.difficulty_index]
+        )
         
         self.reset_button = Button(
             x=WIDTH - 130, y=20, width=110, height=40,
             text="🔄 RESET", color=DARK_GREEN, hover_color=GREEN
         )
-        self.difficulties = list(DIFFICULTY_SETTINGS.keys())
-        self.difficulty_index = 0
         self.diff_button = Button(
             x=WIDTH - 260, y=20, width=120, height=40,
             text=self.difficulties[self.difficulty_index], color=DARK_BLUE, hover_color=BLUE
@@ -213,321 +277,424 @@ class Game:
             x=WIDTH - 640, y=20, width=250, height=40, 
             options=level_names, selected_index=current_idx
         )
+        # HUD pieces that only change with the score, the stats or the game phase.
+        self.score_panel = RetainedSurface(self.build_score_panel)
+        self.stats_panel = RetainedSurface(self.build_stats_panel)
+        self.overlay = RetainedSurface(self.build_overlay)
+        self.banner = RetainedSurface(self.build_banner)
+        self.help_line = RetainedSurface(self.build_help_line)
         
         self.reset_game()
     
     def reset_game(self):
-        self.words = []
-        self.floating_texts = []
-        self.current_input = ""
-        self.score = 0  
-        self.words_typed = 0  
-        self.words_spawned = 0
-        self.total_missed = 0  
-        self.total_attempts = 0  
-        self.game_over = False
-        self.victory = False
-        self.is_new_high_score = False
-        
-        diff_name = self.difficulties[self.difficulty_index]
-        self.current_speed = DIFFICULTY_SETTINGS[diff_name]
-        
-        self.last_spawn_time = pygame.time.get_ticks()
-        self.spawn_delay = int(WORD_SPAWN_DELAY * 1000)
-        self.made_mistake = False
-        self.perfect_words = 0
-        self.backspace_pressed = False
-        self.backspace_last_time = 0
-        self.words_spawned_since_lag = 0
-        self.lag_end_time = 0
-        
-        for _ in range(INITIAL_WORDS):
-            self.spawn_word()
-    
-    def spawn_word(self):
-        word_text = self.word_manager.get_word()
-        x = random.randint(10, WIDTH - 200)
-        y = random.randint(10, 100)
-        current_base = self.current_speed + (self.words_typed * SPEED_INCREASE_PER_WORD)
-        
-        word_length = len(word_text)
-        if word_length <= MIN_WORD_LENGTH:
-            speed = current_base
-        else:
-            speed = current_base * DECELERATION_RATE * (MIN_WORD_LENGTH / word_length)
-            
-        self.words.append(Word(x, y, word_text, speed))
-        self.words_spawned += 1
-        self.total_attempts += 1
-        
-        self.words_spawned_since_lag += 1
-        if self.words_spawned_since_lag >= NUMBER_OF_WORDS_BEFORE_LAG:
-            self.lag_end_time = pygame.time.get_ticks() + (LAG * 1000)
-            self.words_spawned_since_lag = 0
+        self.floating_texts.clear()
+        self.telemetry.start_session(self.word_manager.current_level, self.difficulties[self.difficulty_index])
+        self.sim.reset(difficulty=self.difficulties[self.difficulty_index])
+
+    def seed(self, seed):
+        # Words and their positions follow from these two generators; sprites
+        # use the module one and only look the same on replay.
+        self.word_manager.rng.seed(seed)
+        self.sim.rng.seed(seed + 1)
+        random.seed(seed + 2)
+        self.reset_game()
+
+    def handle_event(self, event):
+        dropdown_event = self.dropdown.handle_event(event)
+        if dropdown_event == "OPENED" or dropdown_event == "CLOSED":
+            return
+        elif dropdown_event:
+            self.word_manager.set_level(dropdown_event)
+            self.reset_game()
+            return
+
+        if not self.dropdown.is_open:
+            if self.reset_button.handle_event(event):
+                self.reset_game()
+            elif self.diff_button.handle_event(event):
+                self.difficulty_index = (self.difficulty_index + 1) % len(self.difficulties)
+                self.diff_button.text = self.difficulties[self.difficulty_index]
+                self.reset_game()
+            elif self.fx_button.handle_event(event):
+                self.sprite_manager.toggle()
+                self.fx_button.text = "🌌 FX ON" if self.sprite_manager.enabled else "🌌 FX OFF"
+
+        if event.type == pygame.KEYDOWN:
+            self.handle_input(event)
+        elif event.type == pygame.KEYUP:
+            self.handle_keyup(event)
     
-    def handle_backspace(self):
-        if len(self.current_input) > 0:
-            self.current_input = self.current_input[:-1]
+    def apply_word_reload(self):
+        # Only ever called between frames, so nothing is mid-draw with the old words.
+        previous_level = self.word_manager.current_level
+        if not self.word_manager.apply_reload():
+            return
+        level_names = self.word_manager.level_names
+        self.dropdown.set_options(level_names, level_names.index(self.word_manager.current_level))
+        self.force_full_redraw = True
+        if self.word_manager.current_level != previous_level:
+            self.reset_game()
+
+    def process_events(self):
+        for event in self.sim.drain_events():
+            if event == "perfect":
+                self.floating_texts.acquire(150, HEIGHT - 110, "+2 Perfect!", PURPLE)
+            else:
+                audio.play(event)
+                if event in END_EVENTS:
+                    self.telemetry.record(END, self.sim.score, self.sim.total_missed)
     
     def handle_input(self, event):
-        if self.game_over or self.victory:
+        if self.sim.finished:
             return
         
         if self.dropdown.is_open:
             return
 
+        sim = self.sim
+        telemetry = self.telemetry
         if event.key == pygame.K_BACKSPACE:
-            self.handle_backspace()
-            self.backspace_pressed = True
-            self.backspace_last_time = pygame.time.get_ticks()
-            self.made_mistake = True
-        
+            sim.press_backspace()
+            telemetry.record(BACKSPACE)
         elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-            matched = False
-            for word in self.words[:]:
-                if word.text.lower() == self.current_input.lower():
-                    self.words.remove(word)
-                    self.words_typed += 1
-                    matched = True
-                    play_correct()
-                    
-                    if not self.made_mistake:
-                        self.score += 2
-                        self.perfect_words += 1
-                        self.floating_texts.append(FloatingText(150, HEIGHT - 110, "+2 Perfect!", PURPLE))
-                    else:
-                        self.score += 1
-                    
-                    self.current_input = ""
-                    self.made_mistake = False
-                    
-                    if not self.victory and not self.game_over:
-                        if pygame.time.get_ticks() > self.lag_end_time:
-                            self.spawn_word()
-                    
-                    if self.score >= TOTAL_WORDS and not self.victory:
-                        self.victory = True
-                        total_att = self.words_typed + self.total_missed
-                        accuracy = (self.words_typed / total_att * 100) if total_att > 0 else 0
-                        diff_name = self.difficulties[self.difficulty_index]
-                        self.is_new_high_score = self.score_manager.update_score(
-                            self.word_manager.current_level, diff_name, accuracy, self.perfect_words
-                        )
-                        play_victory()
-                    break
-            
-            if not matched:
-                self.current_input = ""
-                self.made_mistake = False
-                play_incorrect()
-        
+            typed = len(sim.current_input)
+            cleared = sim.submit()
+            if cleared is None:
+                telemetry.record(MISS, typed)
+            else:
+                telemetry.record(HIT, cleared[0], int(cleared[1]))
         elif event.unicode.isprintable():
-            self.current_input += event.unicode
-        elif event.key == pygame.K_k and pygame.key.get_mods() & pygame.KMOD_CTRL:
-            self.current_input = ""  
-            play_incorrect()  
-            self.made_mistake = True
+            sim.type_text(event.unicode)
+            if event.unicode:
+                telemetry.record(KEY, min(ord(event.unicode[0]), 0xFFFF))
+        elif event.key == pygame.K_k and event.mod & pygame.KMOD_CTRL:
+            telemetry.record(CLEAR, len(sim.current_input))
+            sim.clear_input()
+        self.process_events()
     
     def handle_keyup(self, event):
         if event.key == pygame.K_BACKSPACE:
-            self.backspace_pressed = False
-    
-    def update_backspace_repeat(self):
-        if self.backspace_pressed and not self.game_over and not self.victory:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.backspace_last_time > BACKSPACE_DELAY:
-                if (current_time - self.backspace_last_time - BACKSPACE_DELAY) % BACKSPACE_INTERVAL < 10:
-                    self.handle_backspace()
+            self.sim.release_backspace()
     
     def update(self):
+        self.ticks += 1
         self.sprite_manager.update()
-        if self.victory or self.game_over:
+        self.profiler.mark("sprites")
+        self.step_simulation()
+        self.profiler.mark("simulation")
+
+    def step_simulation(self):
+        if self.sim.finished:
             return
         
         if self.dropdown.is_open:
             return
-            
-        self.update_backspace_repeat()
-        current_time = pygame.time.get_ticks()
         
-        if (current_time - self.last_spawn_time > self.spawn_delay and 
-            len(self.words) < MAX_WORDS_ON_SCREEN and
-            current_time > self.lag_end_time):
-            self.spawn_word()
-            self.last_spawn_time = current_time
-        
-        for word in self.words[:]:
-            word.update()
-            if word.is_off_screen():
-                self.words.remove(word)
-                self.total_missed += 1
-                self.total_attempts += 1
-                play_incorrect()
-                
-                if len(self.words) < MAX_WORDS_ON_SCREEN * 2 and pygame.time.get_ticks() > self.lag_end_time:
-                    self.spawn_word()
-                    
-        for f_text in self.floating_texts[:]:
+        self.sim_clock.advance(TICK_MS)
+        self.sim.step()
+        f_texts = self.floating_texts.items
+        for i in range(len(f_texts) - 1, -1, -1):
+            f_text = f_texts[i]
             f_text.update()
             if f_text.alpha <= 0:
-                self.floating_texts.remove(f_text)
-        
-        if len(self.words) > MAX_WORDS_ON_SCREEN * 2:
-            self.game_over = True
-            total_att = self.words_typed + self.total_missed
-            accuracy = (self.words_typed / total_att * 100) if total_att > 0 else 0
-            diff_name = self.difficulties[self.difficulty_index]
-            self.is_new_high_score = self.score_manager.update_score(
-                self.word_manager.current_level, diff_name, accuracy, self.perfect_words
-            )
-            if accuracy >= 50:
-                play_game_over_good()
-            else:
-                play_game_over_bad()
+                self.floating_texts.release(f_text)
+        self.process_events()
     
-    def draw(self):
-        screen.fill(BLACK)
+    def build_background(self):
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(BLACK)
         for x in range(0, WIDTH, 50):
-            pygame.draw.line(screen, (20, 20, 20), (x, 0), (x, HEIGHT), 1)
+            pygame.draw.line(background, (20, 20, 20), (x, 0), (x, HEIGHT), 1)
         for y in range(0, HEIGHT, 50):
-            pygame.draw.line(screen, (20, 20, 20), (0, y), (WIDTH, y), 1)
-            
-        self.sprite_manager.draw(screen)
+            pygame.draw.line(background, (20, 20, 20), (0, y), (WIDTH, y), 1)
+        return background
+
+    def build_help_line(self):
+        # Not baked into the background: it draws over sprites and words.
+        return text_cache.render(small_font, "⌨️ Space/Enter: submit  |  Ctrl+K: clear", True, (150, 150, 150)), (20, 220)
+
+    def draw(self, alpha=1.0):
+        if self.render_mode == "dirty":
+            self.draw_dirty(alpha)
+        else:
+            screen.blit(self.background, (0, 0))
+            self.draw_scene(screen, alpha)
+            self.profiler.mark("draw")
+            pygame.display.flip()
+            self.profiler.mark("present")
+
+    def draw_dirty(self, alpha=1.0):
+        sim = self.sim
+        overlay_active = sim.victory or sim.game_over
+        if overlay_active or self.force_full_redraw:
+            # The translucent overlay covers the whole window, so redraw it all
+            # and do the same once more on the frame after it goes away.
+            screen.blit(self.background, (0, 0))
+            self.draw_scene(screen, alpha)
+            self.profiler.mark("draw")
+            pygame.display.flip()
+            self.profiler.mark("present")
+            self.previous_rects = []
+            self.force_full_redraw = overlay_active
+            return
+
+        for rect in self.previous_rects:
+            screen.blit(self.background, rect, rect)
+        rects = self.draw_scene(screen, alpha)
+        self.profiler.mark("draw")
+        pygame.display.update(self.previous_rects + rects)
+        self.profiler.mark("present")
+        self.previous_rects = rects
+
+    def build_score_panel(self, score):
+        progress_x, progress_y = WIDTH - 300, 180
+        progress_width, progress_height = 250, 25
+        score_text = text_cache.render(big_font, f"{score}", True, GREEN)
+        score_rect = score_text.get_rect(topleft=(WIDTH - 150, 80))
+        score_label = text_cache.render(small_font, "SCORE", True, WHITE)
+        label_rect = score_label.get_rect(topleft=(WIDTH - 150, 140))
+        progress_rect = pygame.Rect(progress_x, progress_y, progress_width, progress_height)
+        bounds = score_rect.unionall([label_rect, progress_rect])
+        surface, offset = layer(bounds)
+        surface.blit(score_text, score_rect.move(offset))
+        surface.blit(score_label, label_rect.move(offset))
+        
+        progress_rect.move_ip(offset)
+        pygame.draw.rect(surface, (50, 50, 50), progress_rect)
+        if score > 0:
+            fill_width = int((min(score, TOTAL_WORDS) / TOTAL_WORDS) * progress_width)
+            pygame.draw.rect(surface, GREEN, (progress_rect.x, progress_rect.y, fill_width, progress_height))
+        pygame.draw.rect(surface, WHITE, progress_rect, 2)
+        progress_text = text_cache.render(small_font, f"{score}/{TOTAL_WORDS} to win", True, WHITE)
+        surface.blit(progress_text, progress_text.get_rect(center=progress_rect.center))
+        return surface, bounds
+
+    def build_stats_panel(self, speed, perfect, on_screen, missed, accuracy):
+        stats_x, stats_y = 20, 20
+        lines = [
+            (f"⚡ SPEED: {speed}", ORANGE),
+            (f"🌟 PERFECT: {perfect}", PURPLE),
+            (f"📝 ON SCREEN: {on_screen}", BLUE),
+            (f"❌ MISSED: {missed}", RED),
+        ]
+        if accuracy is not None:
+            lines.append((f"🎯 ACCURACY: {accuracy}%", YELLOW))
+        texts = [text_cache.render(small_font, text, True, color) for text, color in lines]
+        rects = [text.get_rect(topleft=(stats_x, stats_y + 40 * i)) for i, text in enumerate(texts)]
+        bounds = rects[0].unionall(rects)
+        surface, offset = layer(bounds)
+        for text, rect in zip(texts, rects):
+            surface.blit(text, rect.move(offset))
+        return surface, bounds
+
+    def build_overlay(self, color):
+        overlay = pygame.Surface((WIDTH, HEIGHT)).convert()
+        overlay.set_alpha(200)
+        overlay.fill(color)
+        return overlay, (0, 0)
+
+    def build_banner(self, victory, losing, score, missed, words_typed, is_new_high_score):
+        banner_x, banner_y = WIDTH//2 - 300, HEIGHT//2 - 150
+        banner_height = 360 if is_new_high_score else 320
+        banner_rect = pygame.Rect(banner_x, banner_y, 600, banner_height)
+        restart_text = text_cache.render(small_font, "Click RESET button to play again", True, WHITE)
+        restart_rect = restart_text.get_rect(center=(WIDTH//2, HEIGHT - 50))
+        bounds = banner_rect.union(restart_rect)
+        surface, offset = layer(bounds)
+        banner_rect.move_ip(offset)
+        center_x = banner_rect.centerx
+        
+        pygame.draw.rect(surface, GOLD if victory else (DARK_RED if losing else DARK_BLUE), banner_rect)
+        pygame.draw.rect(surface, GOLD if victory else (RED if losing else BLUE), banner_rect, 4)
+        
+        title_text = text_cache.render(big_font, "🏆 VICTORY! 🏆" if victory else "GAME OVER", True, GOLD if victory else WHITE)
+        surface.blit(title_text, title_text.get_rect(center=(center_x, banner_rect.y + 50)))
+        
+        score_text = text_cache.render(font, f"✓ SCORE: {score} points", True, GREEN)
+        surface.blit(score_text, score_text.get_rect(center=(center_x, banner_rect.y + 110)))
+        
+        missed_text = text_cache.render(font, f"✗ MISSED: {missed} words", True, RED)
+        surface.blit(missed_text, missed_text.get_rect(center=(center_x, banner_rect.y + 160)))
+        
+        total_attempts = words_typed + missed
+        accuracy = (words_typed / total_attempts) * 100 if total_attempts > 0 else 100
+        
+        accuracy_text = text_cache.render(font, f"🎯 ACCURACY: {accuracy:.1f}%", True, YELLOW)
+        surface.blit(accuracy_text, accuracy_text.get_rect(center=(center_x, banner_rect.y + 210)))
+        
+        if is_new_high_score:
+            hs_text = text_cache.render(small_font, "🎉 NEW HIGH SCORE! 🎉", True, PURPLE)
+            surface.blit(hs_text, hs_text.get_rect(center=(center_x, banner_rect.y + 260)))
+        
+        surface.blit(restart_text, restart_rect.move(offset))
+        return surface, bounds
+
+    def draw_scene(self, surface, alpha=1.0):
+        sim = self.sim
+        dirty = []
+        dirty.extend(self.sprite_manager.draw(surface, alpha))
         
         mouse_pos = pygame.mouse.get_pos()
         self.reset_button.update(mouse_pos)
-        self.reset_button.draw(screen)
+        dirty.append(self.reset_button.draw(surface))
         self.diff_button.update(mouse_pos)
-        self.diff_button.draw(screen)
+        dirty.append(self.diff_button.draw(surface))
         self.fx_button.update(mouse_pos)
-        self.fx_button.draw(screen)
+        dirty.append(self.fx_button.draw(surface))
         self.dropdown.update(mouse_pos)
         
-        if not self.victory and not self.game_over:
-            for word in self.words:
-                word.draw(screen)
+        if not sim.victory and not sim.game_over:
+            highlighted = sim.matcher.highlighted
+            typed = sim.matcher.prefix_length
+            for word in sim.words:
+                dirty.append(draw_word(surface, word, typed if word in highlighted else 0, alpha))
             for f_text in self.floating_texts:
-                f_text.draw(screen)
+                dirty.append(f_text.draw(surface, alpha))
         
-        score_text = big_font.render(f"{self.score}", True, GREEN)
-        screen.blit(score_text, (WIDTH - 150, 80))
-        score_label = small_font.render("SCORE", True, WHITE)
-        screen.blit(score_label, (WIDTH - 150, 140))
+        dirty.append(self.score_panel.draw(surface, sim.score))
+        current_speed = sim.current_speed + (sim.words_typed * SPEED_INCREASE_PER_WORD)
+        total_attempts = sim.words_typed + sim.total_missed
+        accuracy = f"{(sim.words_typed / total_attempts) * 100:.1f}" if total_attempts > 0 else None
+        dirty.append(self.stats_panel.draw(
+            surface, f"{current_speed:.1f}", sim.perfect_words, len(sim.words), sim.total_missed, accuracy
+        ))
+        dirty.append(self.help_line.draw(surface))
         
-        progress_x, progress_y = WIDTH - 300, 180
-        progress_width, progress_height = 250, 25
-        pygame.draw.rect(screen, (50, 50, 50), (progress_x, progress_y, progress_width, progress_height))
-        if self.score > 0:
-            fill_width = int((min(self.score, TOTAL_WORDS) / TOTAL_WORDS) * progress_width)
-            pygame.draw.rect(screen, GREEN, (progress_x, progress_y, fill_width, progress_height))
-        pygame.draw.rect(screen, WHITE, (progress_x, progress_y, progress_width, progress_height), 2)
-        progress_text = small_font.render(f"{self.score}/{TOTAL_WORDS} to win", True, WHITE)
-        screen.blit(progress_text, progress_text.get_rect(center=(progress_x + progress_width//2, progress_y + progress_height//2)))
-        
-        stats_x, stats_y = 20, 20
-        current_speed = self.current_speed + (self.words_typed * SPEED_INCREASE_PER_WORD)
-        screen.blit(small_font.render(f"⚡ SPEED: {current_speed:.1f}", True, ORANGE), (stats_x, stats_y))
-        screen.blit(small_font.render(f"🌟 PERFECT: {self.perfect_words}", True, PURPLE), (stats_x, stats_y + 40))
-        screen.blit(small_font.render(f"📝 ON SCREEN: {len(self.words)}", True, BLUE), (stats_x, stats_y + 80))
-        screen.blit(small_font.render(f"❌ MISSED: {self.total_missed}", True, RED), (stats_x, stats_y + 120))
-        
-        total_attempts = self.words_typed + self.total_missed
-        if total_attempts > 0:
-            accuracy = (self.words_typed / total_attempts) * 100
-            screen.blit(small_font.render(f"🎯 ACCURACY: {accuracy:.1f}%", True, YELLOW), (stats_x, stats_y + 160))
-        
-        screen.blit(small_font.render(f"⌨️ Space/Enter: submit  |  Ctrl+K: clear", True, (150, 150, 150)), (stats_x, stats_y + 200))
-        
-        if not self.victory and not self.game_over:
-            screen.blit(small_font.render("TYPE:", True, GREEN), (50, HEIGHT - 80))
-            input_surface = font.render(f"{self.current_input}", True, GREEN)
-            screen.blit(input_surface, (150, HEIGHT - 88))
-            if not self.dropdown.is_open and pygame.time.get_ticks() % 1000 < 500:
+        if not sim.victory and not sim.game_over:
+            dirty.append(surface.blit(text_cache.render(small_font, "TYPE:", True, GREEN), (50, HEIGHT - 80)))
+            input_surface = text_cache.render(font, f"{sim.current_input}", True, GREEN)
+            dirty.append(surface.blit(input_surface, (150, HEIGHT - 88)))
+            if not self.dropdown.is_open and get_ticks() % 1000 < 500:
                 cursor_x = 150 + input_surface.get_width()
-                pygame.draw.line(screen, GREEN, (cursor_x, HEIGHT - 85), (cursor_x, HEIGHT - 45), 4)
+                dirty.append(pygame.draw.line(surface, GREEN, (cursor_x, HEIGHT - 85), (cursor_x, HEIGHT - 45), 4))
         
-        if self.victory or self.game_over:
-            overlay = pygame.Surface((WIDTH, HEIGHT))
-            overlay.set_alpha(200)
-            overlay.fill((20, 0, 30) if self.victory else ((30, 0, 0) if self.score/(self.score+self.total_missed if self.score+self.total_missed > 0 else 1) < 0.5 else (0, 0, 30)))
-            screen.blit(overlay, (0, 0))
-            
-            banner_x, banner_y = WIDTH//2 - 300, HEIGHT//2 - 150
-            banner_height = 360 if self.is_new_high_score else 320
-            
-            pygame.draw.rect(screen, GOLD if self.victory else (DARK_RED if self.score/(self.score+self.total_missed if self.score+self.total_missed > 0 else 1) < 0.5 else DARK_BLUE), (banner_x, banner_y, 600, banner_height))
-            pygame.draw.rect(screen, GOLD if self.victory else (RED if self.score/(self.score+self.total_missed if self.score+self.total_missed > 0 else 1) < 0.5 else BLUE), (banner_x, banner_y, 600, banner_height), 4)
-            
-            title_text = big_font.render("🏆 VICTORY! 🏆" if self.victory else "GAME OVER", True, GOLD if self.victory else WHITE)
-            screen.blit(title_text, title_text.get_rect(center=(WIDTH//2, banner_y + 50)))
-            
-            score_text = font.render(f"✓ SCORE: {self.score} points", True, GREEN)
-            screen.blit(score_text, score_text.get_rect(center=(WIDTH//2, banner_y + 110)))
-            
-            missed_text = font.render(f"✗ MISSED: {self.total_missed} words", True, RED)
-            screen.blit(missed_text, missed_text.get_rect(center=(WIDTH//2, banner_y + 160)))
-            
-            total_attempts = self.words_typed + self.total_missed
-            accuracy = (self.words_typed / total_attempts) * 100 if total_attempts > 0 else 100
-            
-            accuracy_text = font.render(f"🎯 ACCURACY: {accuracy:.1f}%", True, YELLOW)
-            screen.blit(accuracy_text, accuracy_text.get_rect(center=(WIDTH//2, banner_y + 210)))
-            
-            if self.is_new_high_score:
-                hs_text = small_font.render("🎉 NEW HIGH SCORE! 🎉", True, PURPLE)
-                screen.blit(hs_text, hs_text.get_rect(center=(WIDTH//2, banner_y + 260)))
-            
-            restart_text = small_font.render("Click RESET button to play again", True, WHITE)
-            screen.blit(restart_text, restart_text.get_rect(center=(WIDTH//2, HEIGHT - 50)))
+        if sim.victory or sim.game_over:
+            losing = sim.score/(sim.score+sim.total_missed if sim.score+sim.total_missed > 0 else 1) < 0.5
+            dirty.append(self.overlay.draw(surface, (20, 0, 30) if sim.victory else ((30, 0, 0) if losing else (0, 0, 30))))
+            dirty.append(self.banner.draw(
+                surface, sim.victory, losing, sim.score, sim.total_missed, sim.words_typed, sim.is_new_high_score
+            ))
 
-        self.dropdown.draw(screen)
-        
-        pygame.display.flip()
+        dirty.append(self.dropdown.draw(surface))
+        if self.profiler.enabled:
+            dirty.append(self.profiler.draw(surface, profiler_font))
+        return dirty
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="falling-words", description="A customizable touch-typing game.")
+    parser.add_argument("--render", choices=RENDER_MODES, default="flip",
+                        help="'flip' redraws the whole window each frame, 'dirty' only pushes changed rects")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="render frame rate cap; the game itself always ticks at a fixed rate")
+    parser.add_argument("--fx-storm", type=int, default=0, metavar="N",
+                        help="fill the background with up to N sprites, at most 500 (needs NumPy)")
+    parser.add_argument("--scores", choices=STORAGE_ENGINES, default="json",
+                        help="'sqlite' also keeps every session in sessions.db")
+    parser.add_argument("--player", default="player", help="name recorded with each session")
+    parser.add_argument("--no-watch", action="store_true",
+                        help="do not reload words_config.json when it changes")
+    parser.add_argument("--profile", action="store_true",
+                        help="show the frame profiler overlay (toggle in game with F3)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write per-frame phase timings to PATH as Chrome trace-event JSON")
+    parser.add_argument("--record", metavar="PATH", help="record this session's input to PATH")
+    parser.add_argument("--seed", type=int, help="seed for a recorded session (default: random)")
+    parser.add_argument("--replay", metavar="PATH", help="play back a session recorded with --record")
+    parser.add_argument("--turbo", action="store_true",
+                        help="with --replay: run as fast as possible without a window and report the result")
+    parser.add_argument("--telemetry", metavar="DIR",
+                        help="record keystroke telemetry to DIR, one file per game (off by default)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    replay = Replay(args.replay) if args.replay else None
+    if replay is not None and args.turbo:
+        # Nothing is drawn, so no window either.
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    setup()
+    # Off the input path: the first Enter or Space would otherwise synthesize the tones.
+    audio.start()
+    profiler = FrameProfiler(enabled=args.profile, trace_path=args.trace, budget_ms=1000 / args.fps)
+    # A replay is not the player typing, so it stays out of the telemetry.
+    telemetry_dir = None if replay is not None else args.telemetry
+    game = Game(render_mode=args.render, fx_storm=args.fx_storm, score_storage=args.scores,
+                player=args.player, profiler=profiler, image_cache_dir=DEFAULT_CACHE_DIR,
+                telemetry=KeystrokeTelemetry(telemetry_dir, player=args.player))
+    logger.info(f"Render mode: {args.render}")
+    recorder = None
+    if replay is not None:
+        replay.start(game)
+    elif args.record:
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        recorder = SessionRecorder(game, seed)
+        game.seed(seed)
+    if not args.no_watch and replay is None and recorder is None:
+        # A reload mid-session would change the words a recording depends on.
+        game.word_manager.start_watching()
+
+    if replay is not None and args.turbo:
+        game.sprite_manager.enabled = False
+        replay.run_turbo(game)
+        matched = replay.check(game)
+        shutdown(game, profiler)
+        sys.exit(0 if matched else 1)
 
-def main():
-    if platform.system() != "Windows":
-        logger.warning("winsound only works on Windows. Sound will be disabled.")
-    
-    game = Game()
     running = True
+    accumulator = 0.0
+    last_time = get_ticks()
     
     while running:
+        profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-                
-            dropdown_event = game.dropdown.handle_event(event)
-            
-            if dropdown_event == "OPENED" or dropdown_event == "CLOSED":
-                continue 
-            elif dropdown_event:
-                game.word_manager.set_level(dropdown_event)
-                game.reset_game()
-                continue
-                
-            if not game.dropdown.is_open:
-                if game.reset_button.handle_event(event):
-                    game.reset_game()
-                elif game.diff_button.handle_event(event):
-                    game.difficulty_index = (game.difficulty_index + 1) % len(game.difficulties)
-                    game.diff_button.text = game.difficulties[game.difficulty_index]
-                    game.reset_game()
-                elif game.fx_button.handle_event(event):
-                    game.sprite_manager.toggle()
-                    game.fx_button.text = "🌌 FX ON" if game.sprite_manager.enabled else "🌌 FX OFF"
-            
-            if event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
-                if event.type == pygame.KEYDOWN:
-                    game.handle_input(event)
-                elif event.type == pygame.KEYUP:
-                    game.handle_keyup(event)
-                    
-        game.update()
-        game.draw()
-        clock.tick(FPS)
-    
-    pygame.quit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle()
+                game.force_full_redraw = True
+            elif replay is None:
+                if recorder is not None:
+                    recorder.record(game.ticks, event)
+                game.handle_event(event)
+
+        game.apply_word_reload()
+        profiler.mark("events")
+        # Fixed-timestep simulation: run as many ticks as real time demands,
+        # capped so a long stall does not snowball, then draw in between ticks.
+        now = get_ticks()
+        accumulator = min(accumulator + now - last_time, MAX_TICKS_PER_FRAME * TICK_MS)
+        last_time = now
+        while accumulator >= TICK_MS:
+            if replay is not None:
+                if game.ticks >= replay.ticks:
+                    running = False
+                    break
+                replay.feed(game)
+            game.update()
+            accumulator -= TICK_MS
+        game.draw(accumulator / TICK_MS)
+        startup.report()
+        clock.tick(args.fps)
+        profiler.mark("wait")
+        profiler.end_frame()
+
+    if replay is not None:
+        replay.feed(game)
+        replay.check(game)
+    if recorder is not None:
+        recorder.save(args.record, game)
+    shutdown(game, profiler)
     sys.exit()
 
+def shutdown(game, profiler):
+    text_cache.log_stats()
+    profiler.write_trace()
+    game.score_manager.close()
+    game.telemetry.close()
+    game.word_manager.close()
+    audio.stop()
+    pygame.quit()
+
 if __name__ == "__main__":
     main()
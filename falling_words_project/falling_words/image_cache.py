@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from loguru import logger
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "falling_words", "images")
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+class ImageCache:
+    """Scaled images keyed by (source file hash, size, filter), in memory and on disk.
+
+    The in-memory side is an LRU of ready-to-use images (pygame Surfaces, PIL
+    images, ...) bounded by their pixel bytes; ``max_bytes=0`` turns it off
+    for callers that keep the images themselves. The disk side keeps raw RGBA
+    pixels in ``cache_dir``, one file per key, so a later launch skips both
+    the decode and the resample. Because keys hash the file contents, an
+    edited image never hits a stale entry. Without a ``cache_dir`` nothing is
+    written to disk; the games pass DEFAULT_CACHE_DIR to share one.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hashes = {}
+        self.lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def file_hash(self, path):
+        # Re-hashed only when the file's size or mtime changes. Safe to call
+        # from loader threads.
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            digest = self.hashes.get(memo_key)
+        if digest is None:
+            # Read outside the lock; two threads hashing one file agree anyway.
+            with open(path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            with self.lock:
+                self.hashes[memo_key] = digest
+        return digest
+
+    def disk_path(self, key):
+        source_hash, (width, height), filter_name = key
+        return os.path.join(self.cache_dir, f"{source_hash}-{width}x{height}-{filter_name}.rgba")
+
+    def get(self, source_hash, size, filter_name, build, load):
+        """Return the cached image for this key.
+
+        ``build()`` makes the scaled RGBA bytes on a miss. ``load(data, size)``
+        turns RGBA bytes into the caller's image type.
+        """
+        key = (source_hash, tuple(size), filter_name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        data = self.read(key)
+        with self.lock:
+            if data is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+        if data is None:
+            data = build()
+            self.write(key, data)
+        image = load(data, key[1])
+        if not self.max_bytes:
+            return image
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (image, len(data))
+                self.bytes_used += len(data)
+                while self.bytes_used > self.max_bytes and len(self.entries) > 1:
+                    _, (_, cost) = self.entries.popitem(last=False)
+                    self.bytes_used -= cost
+        return image
+
+    def read(self, key):
+        if self.cache_dir is None:
+            return None
+        width, height = key[1]
+        try:
+            with open(self.disk_path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # A short file is a write that never finished; rebuild it.
+        return data if len(data) == width * height * 4 else None
+
+    def write(self, key, data):
+        if self.cache_dir is None:
+            return
+        path = self.disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write image cache entry {path}: {e}")
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.bytes_used,
+                    "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+def scaled_surface(cache, source_hash, surface, size):
+    """pygame: ``surface`` smoothscaled to ``size``, through the cache."""
+    import pygame
+
+    to_bytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+    def build():
+        return to_bytes(pygame.transform.smoothscale(surface, size), "RGBA")
+
+    def load(data, size):
+        image = pygame.image.frombuffer(data, size, "RGBA")
+        return image.convert_alpha() if pygame.display.get_surface() else image.copy()
+
+    return cache.get(source_hash, size, "smoothscale", build, load)
+
+def scaled_pil_image(cache, path, size):
+    """PIL: the image at ``path`` resized to ``size`` with LANCZOS, through the cache."""
+    from PIL import Image
+
+    def build():
+        with Image.open(path) as img:
+            return img.convert("RGBA").resize(size, Image.Resampling.LANCZOS).tobytes()
+
+    def load(data, size):
+        return Image.frombytes("RGBA", size, data)
+
+    return cache.get(cache.file_hash(path), size, "lanczos", build, load)
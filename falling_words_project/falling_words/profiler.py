@@ -0,0 +1,149 @@
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+from loguru import logger
+
+HISTORY_FRAMES = 240
+# Ten minutes at 60 fps; older frames fall out of the trace.
+TRACE_FRAMES = 36000
+OVERLAY_REFRESH_SECONDS = 0.25
+# Time spent in clock.tick; shown, but not counted as frame work.
+IDLE_PHASE = "wait"
+
+GRAPH_WIDTH, GRAPH_HEIGHT = HISTORY_FRAMES, 80
+PANEL_COLOR = (0, 0, 0, 170)
+GRAPH_COLOR = (0, 200, 255)
+BUDGET_COLOR = (255, 80, 80)
+TEXT_COLOR = (220, 220, 220)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class FrameProfiler:
+    """Per-phase frame timings, an on-screen graph and a Chrome trace export.
+
+    The main loop calls ``begin_frame``, then ``mark(name)`` at the end of each
+    phase (the phase is the time since the previous mark), then ``end_frame``.
+    All three return immediately unless the overlay is shown or a trace is being
+    recorded. Traces open in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self, enabled=False, trace_path=None, budget_ms=1000 / 60):
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.budget_ms = budget_ms
+        self.active = enabled or trace_path is not None
+        self.frame_start = None
+        self.last_mark = None
+        self.phases = []
+        self.work_times = deque(maxlen=HISTORY_FRAMES)
+        self.phase_history = deque(maxlen=HISTORY_FRAMES)
+        self.trace = deque(maxlen=TRACE_FRAMES)
+        self.origin = time.perf_counter()
+        self.panel = None
+        self.panel_time = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.active = self.enabled or self.trace_path is not None
+        self.frame_start = None
+
+    def begin_frame(self):
+        if not self.active:
+            return
+        self.frame_start = self.last_mark = time.perf_counter()
+        self.phases = []
+
+    def mark(self, name):
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, self.last_mark, now - self.last_mark))
+        self.last_mark = now
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        work = sum(duration for name, _, duration in self.phases if name != IDLE_PHASE)
+        self.work_times.append(work * 1000)
+        self.phase_history.append(self.phases)
+        if self.trace_path is not None:
+            self.trace.append((self.frame_start, self.last_mark - self.frame_start, self.phases))
+        self.frame_start = None
+
+    def summary(self):
+        work = sorted(self.work_times)
+        totals = {}
+        for phases in self.phase_history:
+            for name, _, duration in phases:
+                totals[name] = totals.get(name, 0.0) + duration
+        frames = max(1, len(self.phase_history))
+        return {
+            "p50": percentile(work, 0.50),
+            "p95": percentile(work, 0.95),
+            "p99": percentile(work, 0.99),
+            "phases": {name: total * 1000 / frames for name, total in totals.items()},
+        }
+
+    def draw(self, surface, font):
+        """Draw the overlay in the bottom-right corner; returns the dirty rect."""
+        now = time.perf_counter()
+        if self.panel is None or now - self.panel_time >= OVERLAY_REFRESH_SECONDS:
+            self.panel = self.build_panel(font)
+            self.panel_time = now
+        rect = self.panel.get_rect(bottomright=(surface.get_width() - 10, surface.get_height() - 10))
+        return surface.blit(self.panel, rect)
+
+    def build_panel(self, font):
+        stats = self.summary()
+        lines = [f"work ms  p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f}"]
+        lines += [f"{name:<8}{ms:7.2f} ms" for name, ms in stats["phases"].items()]
+        line_height = font.get_linesize()
+        width = GRAPH_WIDTH + 20
+        height = GRAPH_HEIGHT + 20 + line_height * len(lines)
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(PANEL_COLOR)
+
+        # Scale so the frame budget sits at half height unless something is slower.
+        scale_ms = max(2 * self.budget_ms, max(self.work_times, default=0))
+        bottom = 10 + GRAPH_HEIGHT
+        budget_y = bottom - int(self.budget_ms / scale_ms * GRAPH_HEIGHT)
+        pygame.draw.line(panel, BUDGET_COLOR, (10, budget_y), (10 + GRAPH_WIDTH, budget_y))
+        if len(self.work_times) > 1:
+            points = [(10 + i, bottom - int(ms / scale_ms * GRAPH_HEIGHT))
+                      for i, ms in enumerate(self.work_times)]
+            pygame.draw.lines(panel, GRAPH_COLOR, False, points)
+
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, TEXT_COLOR), (10, bottom + 10 + i * line_height))
+        return panel
+
+    def write_trace(self):
+        if self.trace_path is None:
+            return
+        events = []
+        for frame_number, (start, duration, phases) in enumerate(self.trace):
+            events.append({
+                "name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                "ts": (start - self.origin) * 1e6, "dur": duration * 1e6,
+                "args": {"frame": frame_number},
+            })
+            for name, phase_start, phase_duration in phases:
+                events.append({
+                    "name": name, "ph": "X", "pid": 1, "tid": 1,
+                    "ts": (phase_start - self.origin) * 1e6, "dur": phase_duration * 1e6,
+                })
+        tmp_path = self.trace_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            os.replace(tmp_path, self.trace_path)
+            logger.info(f"Wrote {len(self.trace)} frames of trace to {self.trace_path}")
+        except OSError as e:
+            logger.error(f"Could not write frame trace: {e}")
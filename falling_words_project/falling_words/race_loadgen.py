@@ -0,0 +1,134 @@
+"""Load generator for the race server: python -m falling_words.race_loadgen --clients 300
+
+Every client joins, waits for the race to start and then types the oldest
+word on its board at --wpm, pinging the server once a second. At the end it
+reports how many words were typed and the ping round-trip percentiles, which
+include the time the server's event loop took to get to each ping.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from .race_server import DEFAULT_PORT
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+class Bot:
+    def __init__(self, name, wpm, mistake_rate, rng):
+        self.name = name
+        # Five characters per word is the usual WPM convention.
+        self.seconds_per_char = 60 / (wpm * 5)
+        self.mistake_rate = mistake_rate
+        self.rng = rng
+        self.words = {}
+        self.started = asyncio.Event()
+        self.finished = asyncio.Event()
+        self.pings = []
+        self.typed = 0
+        self.score = 0
+        self.bytes_received = 0
+
+    async def run(self, host, port, duration, start_timeout):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(f"J {self.name}\n".encode("utf-8"))
+        tasks = [asyncio.create_task(self.read(reader)),
+                 asyncio.create_task(self.type(writer)),
+                 asyncio.create_task(self.ping(writer))]
+        try:
+            try:
+                await asyncio.wait_for(self.started.wait(), start_timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"{self.name}: the race did not start within {start_timeout:g} s") from None
+            try:
+                await asyncio.wait_for(self.finished.wait(), duration)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def read(self, reader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                self.finished.set()
+                return
+            self.bytes_received += len(line)
+            message = json.loads(line)
+            if "p" in message:
+                self.pings.append(time.perf_counter() - float(message["p"]))
+            if "start" in message:
+                self.started.set()
+            if "w" in message:
+                for word_id, text, *_ in message["w"]:
+                    self.words[word_id] = text
+                for word_id in message["x"]:
+                    self.words.pop(word_id, None)
+                self.score = message["me"][0]
+            if "end" in message:
+                self.finished.set()
+
+    async def type(self, writer):
+        await self.started.wait()
+        while True:
+            if not self.words:
+                await asyncio.sleep(0.05)
+                continue
+            word_id = min(self.words)
+            text = self.words.pop(word_id)
+            await asyncio.sleep(len(text) * self.seconds_per_char)
+            if self.rng.random() < self.mistake_rate:
+                writer.write(b"T x\nB\n")
+            writer.write(f"T {text}\nS\n".encode("utf-8"))
+            self.typed += 1
+
+    async def ping(self, writer):
+        while True:
+            writer.write(f"P {time.perf_counter()!r}\n".encode("utf-8"))
+            await asyncio.sleep(1.0)
+
+async def run(args):
+    rng = random.Random(args.seed)
+    bots = [Bot(f"bot{i}", rng.uniform(args.wpm * 0.6, args.wpm * 1.4), args.mistakes, random.Random(rng.random()))
+            for i in range(args.clients)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bot.run(args.host, args.port, args.duration, args.start_timeout)
+                                     for bot in bots), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failures = [r for r in results if isinstance(r, Exception)]
+    pings = sorted(p * 1000 for bot in bots for p in bot.pings)
+    print(f"{args.clients} clients for {elapsed:.1f} s, {len(failures)} failed to run")
+    print(f"words typed {sum(bot.typed for bot in bots)}, "
+          f"received {sum(bot.bytes_received for bot in bots) / 1024:.0f} KiB")
+    print(f"ping ms: p50 {percentile(pings, 0.5):.2f}  p95 {percentile(pings, 0.95):.2f}  "
+          f"p99 {percentile(pings, 0.99):.2f}  max {pings[-1] if pings else 0:.2f}  ({len(pings)} pings)")
+    if failures:
+        print(f"first failure: {failures[0]!r}")
+    not_started = sum(not bot.started.is_set() for bot in bots)
+    if not_started:
+        print(f"{not_started} clients never saw the race start; "
+              "is --clients below the server's --min-players?")
+    return 1 if failures else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="falling-words-race-loadgen", description="Load-test a race server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to race before disconnecting")
+    parser.add_argument("--wpm", type=float, default=60.0, help="average typing speed of the bots")
+    parser.add_argument("--mistakes", type=float, default=0.1, help="chance a word starts with a typo")
+    parser.add_argument("--start-timeout", type=float, default=30.0,
+                        help="seconds to wait for the race to start before giving up")
+    parser.add_argument("--seed", type=int)
+    return asyncio.run(run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""Falling-words races over TCP: python -m falling_words.race_server
+
+Client -> server, one command per line:
+    J <name>    join the lobby (again, after a race ends)
+    T <text>    type text          S    submit the current input
+    B           backspace          C    clear the input (Ctrl+K)
+    P <n>       ping, answered at once with {"p": n}
+
+Server -> client, one JSON object per line:
+    {"joined": id, "level": ..., "waiting_for": n}
+    {"start": seed}                          the race began
+    {"w": [[id, text, x, y, speed], ...],    words spawned on your board
+     "x": [id, ...],                         words gone from your board
+     "me": [score, missed, perfect, rank]}
+    {"s": [[id, name, score, missed, done], ...]}   the top of the standings, when it changes
+    {"end": {id: [name, score, missed, accuracy]}}
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from loguru import logger
+
+from .simulation import Simulation, ManualClock, DIFFICULTY_SETTINGS, TICK_MS
+from .word_manager import WordManager
+
+DEFAULT_PORT = 8765
+WIDTH, HEIGHT = 900, 650
+# Boards go out every BROADCAST_EVERY ticks (10 Hz at 60 ticks/s), the standings
+# every STANDINGS_EVERY. Everyone gets the top TOP_STANDINGS and their own rank,
+# so traffic grows linearly with the player count rather than quadratically.
+BROADCAST_EVERY = 6
+STANDINGS_EVERY = 30
+TOP_STANDINGS = 10
+# A client this far behind on reading is dropped instead of buffered without limit.
+MAX_CLIENT_BUFFER = 256 * 1024
+MAX_LINE = 1024
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+class RaceWords:
+    """One player's view of the word list: same level, own seeded generator.
+
+    Every player gets the same seed, so the n-th word spawned on every board
+    is the same word, whatever order the players clear them in.
+    """
+
+    def __init__(self, word_manager, level, seed):
+        self.word_manager = word_manager
+        self.current_level = level
+        self.rng = random.Random(seed)
+
+    def get_word(self):
+        return self.rng.choice(self.word_manager.levels[self.current_level])
+
+class RaceSimulation(Simulation):
+    """A Simulation that remembers which words appeared and went since the last flush."""
+
+    def __init__(self, *args, **kwargs):
+        self.word_ids = {}
+        self.next_word_id = 0
+        self.spawned = []
+        self.removed = []
+        super().__init__(*args, **kwargs)
+
+    def spawn_word(self):
+        super().spawn_word()
+        word = self.words.items[-1]
+        self.word_ids[word] = self.next_word_id
+        self.spawned.append([self.next_word_id, word.text, word.x, word.y, round(word.speed, 3)])
+        self.next_word_id += 1
+
+    def remove_word(self, word):
+        self.removed.append(self.word_ids.pop(word))
+        super().remove_word(word)
+
+    def flush(self):
+        spawned, removed = self.spawned, self.removed
+        self.spawned, self.removed = [], []
+        return spawned, removed
+
+class Player:
+    def __init__(self, player_id, name, writer):
+        self.id = player_id
+        self.name = name
+        self.writer = writer
+        self.sim = None
+        self.rank = 0
+
+    def send(self, data):
+        transport = self.writer.transport
+        if transport.is_closing():
+            return False
+        if transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            logger.warning(f"Dropping {self.name}: not reading fast enough")
+            transport.close()
+            return False
+        self.writer.write(data)
+        return True
+
+    def standing(self):
+        sim = self.sim
+        return [self.id, self.name, sim.score, sim.total_missed, sim.finished]
+
+class RaceServer:
+    """Lobby plus one race at a time, every board ticked by a single loop.
+
+    A race starts once ``min_players`` have joined. Each player gets a
+    RaceSimulation on the shared race clock, driven by the same methods
+    Game.handle_input calls, so scoring matches the single-player game.
+    """
+
+    def __init__(self, word_manager, min_players=2, difficulty="BEGINNER"):
+        self.word_manager = word_manager
+        self.min_players = min_players
+        self.difficulty = difficulty
+        self.lobby = []
+        self.players = {}
+        self.next_player_id = 1
+        self.clock = ManualClock()
+        self.seed = None
+        self.top = None
+        self.tick_times = []
+
+    @property
+    def racing(self):
+        return self.seed is not None
+
+    async def handle_client(self, reader, writer):
+        player = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, _, argument = line.decode("utf-8", "replace").rstrip("\r\n").partition(" ")
+                if player is None:
+                    if command == "J":
+                        player = self.join(argument or "player", writer)
+                    elif command == "P":
+                        writer.write(encode({"p": argument}))
+                    continue
+                self.handle_command(player, command, argument)
+        except (ConnectionError, ValueError):
+            # ValueError: a line longer than the stream limit
+            pass
+        finally:
+            if player is not None:
+                self.leave(player)
+            writer.close()
+
+    def join(self, name, writer):
+        player = Player(self.next_player_id, name[:32], writer)
+        self.next_player_id += 1
+        self.lobby.append(player)
+        player.send(encode({
+            "joined": player.id, "level": self.word_manager.current_level,
+            "waiting_for": max(0, self.min_players - len(self.lobby)),
+        }))
+        if not self.racing and len(self.lobby) >= self.min_players:
+            self.start_race()
+        return player
+
+    def leave(self, player):
+        if player in self.lobby:
+            self.lobby.remove(player)
+        if self.players.pop(player.id, None) is not None and not self.players:
+            self.finish_race()
+
+    def handle_command(self, player, command, argument):
+        if command == "P":
+            player.send(encode({"p": argument}))
+            return
+        if command == "J":
+            if player.id not in self.players and player not in self.lobby:
+                self.lobby.append(player)
+                if not self.racing and len(self.lobby) >= self.min_players:
+                    self.start_race()
+            return
+        sim = player.sim
+        if sim is None:
+            return
+        if command == "T":
+            sim.type_text(argument)
+        elif command == "S":
+            sim.submit()
+        elif command == "B":
+            sim.press_backspace()
+            sim.release_backspace()
+        elif command == "C":
+            sim.clear_input()
+
+    def start_race(self):
+        self.seed = random.randrange(2 ** 32)
+        level = self.word_manager.current_level
+        for player in self.lobby:
+            player.sim = RaceSimulation(
+                RaceWords(self.word_manager, level, self.seed), WIDTH, HEIGHT,
+                clock=self.clock, rng=random.Random(self.seed), difficulty=self.difficulty
+            )
+            self.players[player.id] = player
+        self.lobby = []
+        self.top = None
+        self.tick_times = []
+        message = encode({"start": self.seed})
+        for player in self.players.values():
+            player.send(message)
+        logger.info(f"Race started with {len(self.players)} players (seed {self.seed})")
+
+    def finish_race(self):
+        results = {
+            player.id: [player.name, player.sim.score, player.sim.total_missed, round(player.sim.accuracy(), 1)]
+            for player in self.players.values()
+        }
+        message = encode({"end": results})
+        for player in self.players.values():
+            player.send(message)
+        if self.tick_times:
+            times = sorted(self.tick_times)
+            logger.info(
+                f"Race over after {len(times)} ticks: tick p50 {times[len(times) // 2] * 1000:.2f} ms, "
+                f"p99 {times[int(len(times) * 0.99)] * 1000:.2f} ms, max {times[-1] * 1000:.2f} ms"
+            )
+        self.players = {}
+        self.seed = None
+        if len(self.lobby) >= self.min_players:
+            self.start_race()
+
+    def tick(self, tick_number):
+        if not self.racing:
+            return
+        start = time.perf_counter()
+        self.clock.advance(TICK_MS)
+        players = list(self.players.values())
+        for player in players:
+            player.sim.step()
+            player.sim.drain_events()
+        if tick_number % BROADCAST_EVERY == 0:
+            self.broadcast(players, standings=tick_number % STANDINGS_EVERY == 0)
+        self.tick_times.append(time.perf_counter() - start)
+        if all(player.sim.finished for player in players):
+            self.finish_race()
+
+    def broadcast(self, players, standings=True):
+        shared = b""
+        reranked = set()
+        if standings:
+            ranking = sorted(players, key=lambda p: (-p.sim.score, p.sim.total_missed))
+            for rank, player in enumerate(ranking, 1):
+                if player.rank != rank:
+                    player.rank = rank
+                    reranked.add(player.id)
+            top = [player.standing() for player in ranking[:TOP_STANDINGS]]
+            if top != self.top:
+                self.top = top
+                # Encoded once; the same bytes go to everyone.
+                shared = encode({"s": top})
+        for player in players:
+            sim = player.sim
+            spawned, removed = sim.flush()
+            data = shared
+            if spawned or removed or player.id in reranked:
+                data += encode({"w": spawned, "x": removed,
+                                "me": [sim.score, sim.total_missed, sim.perfect_words, player.rank]})
+            if data:
+                player.send(data)
+
+    async def run_ticks(self):
+        # Fixed rate against a monotonic deadline, so a slow tick is made up
+        # rather than pushing every later tick back.
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        tick_number = 0
+        while True:
+            tick_number += 1
+            self.tick(tick_number)
+            next_time += TICK_MS / 1000
+            delay = next_time - loop.time()
+            if delay < -1:
+                next_time = loop.time()
+            await asyncio.sleep(max(0.0, delay))
+
+async def serve(host, port, min_players, difficulty):
+    server = RaceServer(WordManager(), min_players=min_players, difficulty=difficulty)
+    listener = await asyncio.start_server(server.handle_client, host, port, limit=MAX_LINE)
+    logger.info(f"Race server on {host}:{port}, races start at {min_players} players")
+    async with listener:
+        await asyncio.gather(listener.serve_forever(), server.run_ticks())
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="falling-words-race", description="Host falling-words races.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--min-players", type=int, default=2, help="players needed to start a race")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_SETTINGS), default="BEGINNER")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.min_players, args.difficulty))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import json
+import struct
+import time
+
+import pygame
+from loguru import logger
+
+MAGIC = b"FWREPLAY"
+VERSION = 1
+# magic, version, header length
+PREAMBLE = struct.Struct("<8sII")
+# tick the event was handled before, event kind
+EVENT = struct.Struct("<IB")
+# key, modifiers, length of the UTF-8 unicode text that follows
+KEY = struct.Struct("<iHB")
+# x, y, button
+MOUSE = struct.Struct("<hhB")
+
+KEYDOWN, KEYUP, MOUSEBUTTONDOWN = 1, 2, 3
+EVENT_KINDS = {pygame.KEYDOWN: KEYDOWN, pygame.KEYUP: KEYUP, pygame.MOUSEBUTTONDOWN: MOUSEBUTTONDOWN}
+PYGAME_TYPES = {kind: event_type for event_type, kind in EVENT_KINDS.items()}
+
+def session_result(game):
+    sim = game.sim
+    return {"score": sim.score, "missed": sim.total_missed, "accuracy": round(sim.accuracy(), 6)}
+
+class SessionRecorder:
+    """Collects the input a Game sees, keyed by simulation tick, and saves it.
+
+    The game is seeded before the session starts, so the seed plus the input
+    stream reproduces every word, position and result. File layout: preamble,
+    JSON header (seed, level, tick count, final result), then fixed-size event
+    records, key events followed by their unicode text.
+    """
+
+    def __init__(self, game, seed):
+        self.seed = seed
+        self.level = game.word_manager.current_level
+        self.difficulty_index = game.difficulty_index
+        self.events = bytearray()
+        self.count = 0
+
+    def record(self, tick, event):
+        kind = EVENT_KINDS.get(event.type)
+        if kind is None:
+            return
+        self.events += EVENT.pack(tick, kind)
+        if kind == MOUSEBUTTONDOWN:
+            self.events += MOUSE.pack(event.pos[0], event.pos[1], event.button)
+        else:
+            text = getattr(event, "unicode", "").encode("utf-8")
+            self.events += KEY.pack(event.key, event.mod & 0xFFFF, len(text)) + text
+        self.count += 1
+
+    def save(self, path, game):
+        header = json.dumps({
+            "seed": self.seed, "level": self.level, "difficulty_index": self.difficulty_index,
+            "ticks": game.ticks, "events": self.count, "result": session_result(game),
+        }).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+            f.write(header)
+            f.write(self.events)
+        logger.info(f"Recorded {self.count} events over {game.ticks} ticks to {path} "
+                    f"({PREAMBLE.size + len(header) + len(self.events)} bytes)")
+
+class Replay:
+    """A saved session, fed back into a Game tick by tick."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, header_length = PREAMBLE.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} session recording")
+        position = PREAMBLE.size
+        header = json.loads(data[position:position + header_length])
+        position += header_length
+        self.seed = header["seed"]
+        self.level = header["level"]
+        self.difficulty_index = header["difficulty_index"]
+        self.ticks = header["ticks"]
+        self.expected = header["result"]
+
+        self.events = []
+        while position < len(data):
+            tick, kind = EVENT.unpack_from(data, position)
+            position += EVENT.size
+            if kind == MOUSEBUTTONDOWN:
+                x, y, button = MOUSE.unpack_from(data, position)
+                position += MOUSE.size
+                event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=button)
+            else:
+                key, mod, length = KEY.unpack_from(data, position)
+                position += KEY.size
+                text = data[position:position + length].decode("utf-8")
+                position += length
+                event = pygame.event.Event(PYGAME_TYPES[kind], key=key, mod=mod, unicode=text)
+            self.events.append((tick, event))
+        self.next_event = 0
+
+    @property
+    def finished(self):
+        return self.next_event >= len(self.events)
+
+    def start(self, game):
+        if self.level in game.word_manager.levels:
+            game.word_manager.set_level(self.level)
+            game.dropdown.selected_index = game.word_manager.level_names.index(self.level)
+        else:
+            logger.warning(f"Recorded level '{self.level}' is not loaded; the replay will diverge.")
+        game.difficulty_index = self.difficulty_index
+        game.diff_button.text = game.difficulties[game.difficulty_index]
+        # Replays never touch the high score table.
+        game.sim.score_manager = None
+        game.seed(self.seed)
+
+    def feed(self, game):
+        """Hand the game every event recorded before its current tick."""
+        events = self.events
+        while self.next_event < len(events) and events[self.next_event][0] <= game.ticks:
+            game.handle_event(events[self.next_event][1])
+            self.next_event += 1
+
+    def run_turbo(self, game):
+        """Replay the whole session without drawing; returns ticks per second."""
+        start = time.perf_counter()
+        while game.ticks < self.ticks:
+            self.feed(game)
+            game.update()
+        self.feed(game)
+        elapsed = time.perf_counter() - start
+        rate = self.ticks / elapsed if elapsed > 0 else float("inf")
+        logger.info(f"Turbo replay: {self.ticks} ticks in {elapsed * 1000:.1f} ms ({rate:,.0f} ticks/s)")
+        return rate
+
+    def check(self, game):
+        result = session_result(game)
+        if result == self.expected:
+            logger.info(f"Replay matches the recording: {result}")
+        else:
+            logger.error(f"Replay diverged: recorded {self.expected}, replayed {result}")
+        return result == self.expected
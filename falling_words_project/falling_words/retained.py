@@ -0,0 +1,36 @@
+import pygame
+
+class RetainedSurface:
+    """A widget's pre-rendered look, rebuilt only when its state changes.
+
+    ``build(*state)`` returns ``(surface, rect)``: the widget drawn onto a
+    surface of its own and the screen rect to blit it at. ``draw`` blits
+    the cached surface and calls ``build`` again only if ``state`` differs
+    from last time, so the state tuple must hold everything the look
+    depends on (text, colours, hover, selection, ...).
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.state = None
+        self.surface = None
+        self.rect = None
+        self.rebuilds = 0
+
+    def draw(self, target, *state):
+        if self.surface is None or state != self.state:
+            self.surface, self.rect = self.build(*state)
+            self.state = state
+            self.rebuilds += 1
+        return target.blit(self.surface, self.rect)
+
+    def invalidate(self):
+        self.surface = None
+
+def layer(bounds):
+    """Transparent surface covering ``bounds``, plus the offset that maps screen to layer coordinates."""
+    surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+        surface.fill((0, 0, 0, 0))
+    return surface, (-bounds.x, -bounds.y)
@@ -1,43 +1,211 @@
+import atexit
 import json
 import os
+import queue
+import threading
+import time
 from loguru import logger
 
+from .startup import startup
+
+COMPACT_EVERY = 50
+WRITE_BATCH_SECONDS = 0.5
+STORAGE_ENGINES = ("json", "sqlite")
+
 class ScoreManager:
-    def __init__(self, filename="highscores.json"):
+    """High scores kept in memory and persisted by a background writer.
+
+    Records are appended to ``<filename>.journal`` (one JSON object per line)
+    and the journal is periodically compacted into the main JSON file with a
+    temp-file + ``os.replace``. Loading replays the journal over the main file
+    and ignores a torn last line, so a crash mid-write loses at most that record.
+
+    With ``storage="sqlite"`` every finished session is also recorded in a
+    SessionStore (``db_filename``) and the best-per-key table is read from it;
+    an existing JSON file is imported the first time the database is created.
+    """
+
+    def __init__(self, filename="highscores.json", compact_every=COMPACT_EVERY,
+                 storage="json", db_filename="sessions.db", player="player"):
+        if storage not in STORAGE_ENGINES:
+            raise ValueError(f"Unknown score storage '{storage}', expected one of {STORAGE_ENGINES}")
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.filepath = os.path.join(base_dir, filename)
-        self.scores = self.load_scores()
+        self.journal_path = self.filepath + ".journal"
+        self.storage = storage
+        self.db_path = os.path.join(base_dir, db_filename)
+        self.player = player
+        self.store = None
+        self.compact_every = compact_every
+        self.journal_entries = 0
+        self.journal_torn = False
+        self._scores = None
+        self.lock = threading.Lock()
+        self.loaded = threading.Event()
+        self.pending = queue.Queue()
+        self.closed = False
+        self.writer = threading.Thread(target=self._writer_loop, name="score-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    @property
+    def scores(self):
+        # Loaded by the writer thread; only waits if a score is needed that early.
+        self.loaded.wait()
+        return self._scores
+
+    @scores.setter
+    def scores(self, value):
+        self._scores = value
 
     def load_scores(self):
+        data = {}
         if os.path.exists(self.filepath):
             try:
                 with open(self.filepath, "r", encoding="utf-8") as f:
                     data = json.load(f)
-                    return data
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse high scores JSON: {e}")
-        return {}
+        self.journal_entries = 0
+        self.journal_torn = False
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    try:
+                        record = json.loads(line)
+                        data[record["key"]] = {
+                            "accuracy": record["accuracy"],
+                            "perfect_words": record["perfect_words"]
+                        }
+                        self.journal_entries += 1
+                    except (json.JSONDecodeError, KeyError) as e:
+                        self.journal_torn = True
+                        logger.warning(f"Ignoring torn high score journal entry at line {line_number}: {e}")
+        return data
 
     def save_scores(self):
+        with self.lock:
+            snapshot = dict(self._scores)
+        tmp_path = self.filepath + ".tmp"
         try:
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump(self.scores, f, indent=4)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filepath)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.journal_entries = 0
         except Exception as e:
             logger.error(f"Error saving high scores: {e}")
 
-    def update_score(self, level_name, difficulty_name, accuracy, perfect_words):
+    def append_journal(self, records):
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.journal_entries += len(records)
+        except Exception as e:
+            logger.error(f"Error writing high score journal: {e}")
+
+    def load_from_store(self):
+        from .session_store import SessionStore
+
+        # Opened here so the connection belongs to the writer thread.
+        self.store = SessionStore(self.db_path)
+        if self.store.count() == 0 and os.path.exists(self.filepath):
+            self.store.import_json(self.filepath)
+        return self.store.best_scores()
+
+    def write_batch(self, batch):
+        if self.storage == "json":
+            self.append_journal(batch)
+        elif self.store is None:
+            # Session records are not high score records; never journal them.
+            logger.error(f"Session database {self.db_path} is not open; {len(batch)} sessions not recorded.")
+        else:
+            try:
+                self.store.record_sessions(batch)
+            except Exception as e:
+                logger.error(f"Error recording sessions: {e}")
+
+    def _writer_loop(self):
+        try:
+            with startup.phase("score file"):
+                if self.storage == "sqlite":
+                    self._scores = self.load_from_store()
+                else:
+                    self._scores = self.load_scores()
+        except Exception as e:
+            logger.error(f"Could not read high scores: {e}")
+            self._scores = {}
+        finally:
+            self.loaded.set()
+        # A torn tail must go before anything is appended after it.
+        if self.journal_torn or self.journal_entries >= self.compact_every:
+            self.save_scores()
+
+        running = True
+        while running:
+            record = self.pending.get()
+            batch = []
+            # Give rapid updates a moment to pile up so they share one fsync.
+            while record is not None:
+                batch.append(record)
+                try:
+                    record = self.pending.get(timeout=WRITE_BATCH_SECONDS)
+                except queue.Empty:
+                    break
+            if record is None:
+                running = False
+            if batch:
+                self.write_batch(batch)
+            if not running or self.journal_entries >= self.compact_every:
+                if self.journal_entries:
+                    self.save_scores()
+        if self.store is not None:
+            self.store.close()
+
+    def close(self):
+        # Flushes queued records and compacts the journal before returning.
+        if self.closed:
+            return
+        self.closed = True
+        self.pending.put(None)
+        self.writer.join()
+        # The exit hook would otherwise keep every closed manager alive.
+        atexit.unregister(self.close)
+
+    def update_score(self, level_name, difficulty_name, accuracy, perfect_words, duration=None):
         key = f"{level_name}_{difficulty_name}"
         current_best = self.scores.get(key, {"accuracy": 0.0, "perfect_words": 0})
         is_new_record = False
-        
+
         if (accuracy > current_best["accuracy"]) or \
            (accuracy == current_best["accuracy"] and perfect_words > current_best["perfect_words"]):
-            self.scores[key] = {
+            record = {
                 "accuracy": round(accuracy, 1),
                 "perfect_words": perfect_words
             }
-            self.save_scores()
+            with self.lock:
+                self.scores[key] = record
+            if self.storage == "json":
+                self.enqueue({"key": key, **record})
             is_new_record = True
             logger.info(f"🏆 NEW HIGH SCORE for [{key}]: Accuracy {accuracy:.1f}%, Perfects: {perfect_words}")
-            
+
+        if self.storage == "sqlite":
+            self.enqueue({
+                "player": self.player, "level": level_name, "difficulty": difficulty_name,
+                "accuracy": round(accuracy, 1), "perfect_words": perfect_words,
+                "duration": duration, "played_at": time.time(),
+            })
         return is_new_record
+
+    def enqueue(self, record):
+        if self.closed:
+            logger.warning(f"ScoreManager closed; {record} not persisted.")
+        else:
+            self.pending.put(record)
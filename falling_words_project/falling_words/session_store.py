@@ -0,0 +1,157 @@
+import json
+import os
+import sqlite3
+import time
+from loguru import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    level TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    accuracy REAL NOT NULL,
+    perfect_words INTEGER NOT NULL,
+    duration REAL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_leaderboard
+    ON sessions (level, difficulty, accuracy DESC, perfect_words DESC);
+CREATE INDEX IF NOT EXISTS sessions_player
+    ON sessions (player, level, difficulty, accuracy DESC, perfect_words DESC);
+CREATE INDEX IF NOT EXISTS sessions_played_at ON sessions (played_at);
+
+-- Running per-level aggregates so summaries never scan the sessions table.
+CREATE TABLE IF NOT EXISTS level_stats (
+    level TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    accuracy_total REAL NOT NULL,
+    best_accuracy REAL NOT NULL,
+    PRIMARY KEY (level, difficulty)
+);
+CREATE TRIGGER IF NOT EXISTS sessions_level_stats AFTER INSERT ON sessions BEGIN
+    INSERT INTO level_stats VALUES (NEW.level, NEW.difficulty, 1, NEW.accuracy, NEW.accuracy)
+    ON CONFLICT (level, difficulty) DO UPDATE SET
+        sessions = sessions + 1,
+        accuracy_total = accuracy_total + NEW.accuracy,
+        best_accuracy = MAX(best_accuracy, NEW.accuracy);
+END;
+"""
+
+BACKFILL_LEVEL_STATS = """
+INSERT INTO level_stats
+SELECT level, difficulty, COUNT(*), SUM(accuracy), MAX(accuracy) FROM sessions GROUP BY level, difficulty
+"""
+
+SESSION_COLUMNS = ("player", "level", "difficulty", "accuracy", "perfect_words", "duration", "played_at")
+
+class SessionStore:
+    """Every played session in SQLite, indexed for leaderboard queries.
+
+    A connection belongs to the thread that opened it; open one store per thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM level_stats)").fetchone()[0]:
+            with self.conn:
+                self.conn.execute(BACKFILL_LEVEL_STATS)
+
+    def close(self):
+        self.conn.close()
+
+    def record_sessions(self, sessions):
+        rows = [
+            (s["player"], s["level"], s["difficulty"], s["accuracy"], s["perfect_words"],
+             s.get("duration"), s.get("played_at") or time.time())
+            for s in sessions
+        ]
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO sessions ({', '.join(SESSION_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def record_session(self, player, level, difficulty, accuracy, perfect_words, duration=None, played_at=None):
+        self.record_sessions([{
+            "player": player, "level": level, "difficulty": difficulty, "accuracy": accuracy,
+            "perfect_words": perfect_words, "duration": duration, "played_at": played_at,
+        }])
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def top(self, level, difficulty, limit=10):
+        return self.conn.execute(
+            "SELECT player, accuracy, perfect_words, duration, played_at FROM sessions "
+            "WHERE level = ? AND difficulty = ? "
+            "ORDER BY accuracy DESC, perfect_words DESC LIMIT ?",
+            (level, difficulty, limit),
+        ).fetchall()
+
+    def best(self, level, difficulty, player=None):
+        if player is None:
+            rows = self.top(level, difficulty, limit=1)
+        else:
+            rows = self.conn.execute(
+                "SELECT player, accuracy, perfect_words, duration, played_at FROM sessions "
+                "WHERE player = ? AND level = ? AND difficulty = ? "
+                "ORDER BY accuracy DESC, perfect_words DESC LIMIT 1",
+                (player, level, difficulty),
+            ).fetchall()
+        return rows[0] if rows else None
+
+    def player_bests(self, player):
+        # One row per (level, difficulty), walked straight off the player index.
+        return self.conn.execute(
+            "SELECT level, difficulty, accuracy, perfect_words, duration, played_at FROM ("
+            "  SELECT *, ROW_NUMBER() OVER ("
+            "    PARTITION BY level, difficulty ORDER BY accuracy DESC, perfect_words DESC"
+            "  ) AS rank FROM sessions WHERE player = ?"
+            ") WHERE rank = 1 ORDER BY level, difficulty",
+            (player,),
+        ).fetchall()
+
+    def level_summary(self, level):
+        return self.conn.execute(
+            "SELECT difficulty, sessions, accuracy_total / sessions AS avg_accuracy, best_accuracy "
+            "FROM level_stats WHERE level = ? ORDER BY difficulty",
+            (level,),
+        ).fetchall()
+
+    def best_scores(self):
+        """Best record per "<level>_<difficulty>" key, in ScoreManager's JSON layout."""
+        scores = {}
+        for level, difficulty in self.conn.execute("SELECT level, difficulty FROM level_stats").fetchall():
+            row = self.best(level, difficulty)
+            scores[f"{level}_{difficulty}"] = {
+                "accuracy": row["accuracy"],
+                "perfect_words": row["perfect_words"]
+            }
+        return scores
+
+    def import_json(self, json_path, player="imported"):
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Could not import high scores from {json_path}: {e}")
+            return 0
+        played_at = os.path.getmtime(json_path)
+        sessions = []
+        for key, record in data.items():
+            # Difficulty names never contain "_", level names might.
+            level, _, difficulty = key.rpartition("_")
+            sessions.append({
+                "player": player, "level": level, "difficulty": difficulty,
+                "accuracy": record["accuracy"], "perfect_words": record["perfect_words"],
+                "played_at": played_at,
+            })
+        self.record_sessions(sessions)
+        logger.info(f"Imported {len(sessions)} high scores from {json_path}")
+        return len(sessions)
@@ -0,0 +1,270 @@
+import random
+
+from .entity_pool import EntityPool
+from .word_matcher import WordMatcher
+
+TOTAL_WORDS = 30
+SPEED_INCREASE_PER_WORD = 0.02
+MAX_WORDS_ON_SCREEN = 10
+INITIAL_WORDS = 1
+WORD_SPAWN_DELAY = 2.0
+BACKSPACE_DELAY = 150
+BACKSPACE_INTERVAL = 50
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+
+MIN_WORD_LENGTH = 3
+DECELERATION_RATE = 1.0
+NUMBER_OF_WORDS_BEFORE_LAG = 4
+LAG = 5
+
+DIFFICULTY_SETTINGS = {
+    "BEGINNER": 1.0,
+    "STANDARD": 1.5,
+    "EXPERT": 2.0
+}
+
+class ManualClock:
+    """Millisecond clock that only moves when advanced; stands in for pygame.time.get_ticks."""
+
+    def __init__(self, start=0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms
+
+class Word:
+    __slots__ = ("x", "y", "prev_y", "text", "speed", "spawn_time", "pool_index")
+
+    def __init__(self, x=0, y=0, text="", speed=0, spawn_time=0):
+        self.pool_index = -1
+        self.reset(x, y, text, speed, spawn_time)
+
+    def reset(self, x, y, text, speed, spawn_time=0):
+        self.x = x
+        self.y = y
+        self.prev_y = y
+        self.text = text
+        self.speed = speed
+        self.spawn_time = spawn_time
+
+    def update(self):
+        self.prev_y = self.y
+        self.y += self.speed
+
+    def draw_y(self, alpha):
+        return self.prev_y + (self.y - self.prev_y) * alpha
+
+class Simulation:
+    """Game rules with no display: words, spawn/lag timers, scoring and end states.
+
+    Time comes from the injected ``clock`` (a callable returning milliseconds) and
+    input arrives through ``type_text``/``submit``/``press_backspace``/... calls.
+    Side effects for the front end (sounds, floating text) are queued in
+    ``events`` and collected with ``drain_events``.
+    """
+
+    def __init__(self, word_manager, width, height, clock=None, rng=None,
+                 score_manager=None, difficulty="BEGINNER"):
+        self.word_manager = word_manager
+        self.width = width
+        self.height = height
+        self.floor = height - 100
+        self.clock = clock if clock is not None else ManualClock()
+        self.rng = rng if rng is not None else random.Random()
+        self.score_manager = score_manager
+        self.difficulty = difficulty
+        self.events = []
+        self.words = EntityPool(Word)
+        self.reset()
+
+    def reset(self, difficulty=None):
+        if difficulty is not None:
+            self.difficulty = difficulty
+        self.words.clear()
+        self.matcher = WordMatcher()
+        self.events = []
+        self.current_input = ""
+        self.score = 0
+        self.words_typed = 0
+        self.words_spawned = 0
+        self.total_missed = 0
+        self.total_attempts = 0
+        self.game_over = False
+        self.victory = False
+        self.is_new_high_score = False
+
+        self.current_speed = DIFFICULTY_SETTINGS[self.difficulty]
+
+        self.start_time = self.clock()
+        self.last_spawn_time = self.start_time
+        self.spawn_delay = int(WORD_SPAWN_DELAY * 1000)
+        self.made_mistake = False
+        self.perfect_words = 0
+        self.backspace_pressed = False
+        self.backspace_next_time = 0
+        self.words_spawned_since_lag = 0
+        self.lag_end_time = 0
+
+        for _ in range(INITIAL_WORDS):
+            self.spawn_word()
+
+    @property
+    def finished(self):
+        return self.victory or self.game_over
+
+    def accuracy(self):
+        total_att = self.words_typed + self.total_missed
+        return (self.words_typed / total_att * 100) if total_att > 0 else 0
+
+    def drain_events(self):
+        events, self.events = self.events, []
+        return events
+
+    def spawn_word(self):
+        word_text = self.word_manager.get_word()
+        x = self.rng.randint(10, self.width - 200)
+        y = self.rng.randint(10, 100)
+        current_base = self.current_speed + (self.words_typed * SPEED_INCREASE_PER_WORD)
+
+        word_length = len(word_text)
+        if word_length <= MIN_WORD_LENGTH:
+            speed = current_base
+        else:
+            speed = current_base * DECELERATION_RATE * (MIN_WORD_LENGTH / word_length)
+
+        word = self.words.acquire(x, y, word_text, speed, self.clock())
+        self.matcher.add(word)
+        self.words_spawned += 1
+        self.total_attempts += 1
+
+        self.words_spawned_since_lag += 1
+        if self.words_spawned_since_lag >= NUMBER_OF_WORDS_BEFORE_LAG:
+            self.lag_end_time = self.clock() + (LAG * 1000)
+            self.words_spawned_since_lag = 0
+
+    def record_result(self):
+        accuracy = self.accuracy()
+        if self.score_manager:
+            self.is_new_high_score = self.score_manager.update_score(
+                self.word_manager.current_level, self.difficulty, accuracy, self.perfect_words,
+                duration=(self.clock() - self.start_time) / 1000
+            )
+        return accuracy
+
+    def handle_backspace(self):
+        if len(self.current_input) > 0:
+            self.current_input = self.current_input[:-1]
+            self.matcher.pop()
+
+    def type_text(self, text):
+        if self.finished:
+            return
+        self.current_input += text
+        self.matcher.push(text)
+
+    def remove_word(self, word):
+        self.matcher.remove(word)
+        self.words.release(word)
+
+    def press_backspace(self):
+        if self.finished:
+            return
+        self.handle_backspace()
+        self.backspace_pressed = True
+        self.backspace_next_time = self.clock() + BACKSPACE_DELAY
+        self.made_mistake = True
+
+    def release_backspace(self):
+        self.backspace_pressed = False
+
+    def clear_input(self):
+        if self.finished:
+            return
+        self.current_input = ""
+        self.matcher.clear_input()
+        self.events.append("incorrect")
+        self.made_mistake = True
+
+    def submit(self):
+        # Returns (length, ms on screen) of the word the input cleared, or None.
+        if self.finished:
+            return None
+        word = self.matcher.match()
+        self.current_input = ""
+        self.matcher.clear_input()
+        made_mistake = self.made_mistake
+        self.made_mistake = False
+
+        if word is None:
+            self.events.append("incorrect")
+            return None
+
+        cleared = (len(word.text), self.clock() - word.spawn_time)
+        self.remove_word(word)
+        self.words_typed += 1
+        self.events.append("correct")
+
+        if not made_mistake:
+            self.score += 2
+            self.perfect_words += 1
+            self.events.append("perfect")
+        else:
+            self.score += 1
+
+        if self.clock() > self.lag_end_time:
+            self.spawn_word()
+
+        if self.score >= TOTAL_WORDS:
+            self.victory = True
+            self.record_result()
+            self.events.append("victory")
+        return cleared
+
+    def update_backspace_repeat(self):
+        if self.backspace_pressed and not self.game_over and not self.victory:
+            current_time = self.clock()
+            while current_time >= self.backspace_next_time:
+                self.handle_backspace()
+                self.backspace_next_time += BACKSPACE_INTERVAL
+
+    def step(self):
+        if self.victory or self.game_over:
+            return
+
+        self.update_backspace_repeat()
+        current_time = self.clock()
+
+        if (current_time - self.last_spawn_time > self.spawn_delay and
+            len(self.words) < MAX_WORDS_ON_SCREEN and
+            current_time > self.lag_end_time):
+            self.spawn_word()
+            self.last_spawn_time = current_time
+
+        # Walk backwards: releasing swaps the last word into the freed slot.
+        words = self.words.items
+        for i in range(len(words) - 1, -1, -1):
+            word = words[i]
+            word.update()
+            if word.y > self.floor:
+                self.remove_word(word)
+                self.total_missed += 1
+                self.total_attempts += 1
+                self.events.append("incorrect")
+
+                if len(self.words) < MAX_WORDS_ON_SCREEN * 2 and self.clock() > self.lag_end_time:
+                    self.spawn_word()
+
+        if len(self.words) > MAX_WORDS_ON_SCREEN * 2:
+            self.game_over = True
+            accuracy = self.record_result()
+            self.events.append("game_over_good" if accuracy >= 50 else "game_over_bad")
+
+    def run(self, ticks):
+        """Advance a ManualClock by one tick and step, ``ticks`` times."""
+        for _ in range(ticks):
+            self.clock.advance(TICK_MS)
+            self.step()
@@ -2,12 +2,112 @@ import pygame
 import random
 import os
 import glob
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from loguru import logger
 
+from .entity_pool import EntityPool
+from .image_cache import ImageCache, scaled_surface
+from .startup import startup
+
+SWARM_ATLAS_BYTES = 64 * 1024 * 1024
+ASSET_WORKERS = 4
+# convert_alpha copies pixels on the main thread; spread big packs over frames.
+ASSETS_PER_FRAME = 2
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def make_fallback_surface(size):
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    color = (random.randint(50, 255), random.randint(50, 255), random.randint(50, 255))
+    alpha = random.randint(80, 160)
+    if random.choice([True, False]):
+        pygame.draw.circle(surface, (*color, alpha), (size//2, size//2), size//2)
+    else:
+        points = [(size//2, 0), (size, size//2), (size//2, size), (0, size//2)]
+        pygame.draw.polygon(surface, (*color, alpha), points)
+    return surface
+
+def smoothscale(image_key, image_surface, size):
+    return pygame.transform.smoothscale(image_surface, (size, size))
+
+class RotationAtlas:
+    def __init__(self, step=5, max_bytes=32 * 1024 * 1024, scaler=smoothscale):
+        self.step = step
+        self.scaler = scaler
+        self.frame_count = max(1, int(round(360 / step)))
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+
+    def _add(self, key, base):
+        entry = {"base": base, "frames": [None] * self.frame_count, "bytes": surface_bytes(base)}
+        self.entries[key] = entry
+        self.bytes_used += entry["bytes"]
+        self._evict()
+        return entry
+
+    def _evict(self):
+        # The most recently used entry sits at the end and is never evicted.
+        while self.bytes_used > self.max_bytes and len(self.entries) > 1:
+            _, entry = self.entries.popitem(last=False)
+            self.bytes_used -= entry["bytes"]
+
+    def scaled(self, image_key, image_surface, size):
+        key = (image_key, size)
+        entry = self.entries.get(key)
+        if entry is None:
+            base = self.scaler(image_key, image_surface, size)
+            entry = self._add(key, base)
+        return entry["base"]
+
+    def frame(self, image_key, base, angle):
+        key = (image_key, base.get_width())
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self._add(key, base)
+        else:
+            self.entries.move_to_end(key)
+
+        index = int(round(angle / self.step)) % self.frame_count
+        frame = entry["frames"][index]
+        if frame is None:
+            frame = pygame.transform.rotate(base, index * self.step)
+            # RLE-encoded alpha skips the transparent corners on every blit,
+            # several times faster for rotated sprites.
+            frame.set_alpha(255, pygame.RLEACCEL)
+            cost = surface_bytes(frame)
+            entry["frames"][index] = frame
+            entry["bytes"] += cost
+            self.bytes_used += cost
+            self._evict()
+            if self.bytes_used > self.max_bytes:
+                # This entry alone is over the cap: hand the frame out uncached.
+                entry["frames"][index] = None
+                entry["bytes"] -= cost
+                self.bytes_used -= cost
+        return frame
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
 class FloatingSprite:
-    def __init__(self, screen_width, screen_height, image_surface=None):
+    __slots__ = (
+        "screen_width", "screen_height", "size", "x", "y", "moving_up", "speed_x", "speed_y",
+        "angle", "rotation_speed", "prev_x", "prev_y", "prev_angle", "atlas", "image_key",
+        "original_surface", "pool_index",
+    )
+
+    def __init__(self, screen_width, screen_height, image_surface=None, atlas=None, image_key=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.pool_index = -1
+        self.reset(image_surface, atlas, image_key)
+
+    def reset(self, image_surface=None, atlas=None, image_key=None):
+        screen_width, screen_height = self.screen_width, self.screen_height
         self.size = random.randint(40, 90)
         self.x = random.randint(self.size, screen_width - self.size)
         
@@ -22,20 +122,19 @@ class FloatingSprite:
         self.speed_x = random.uniform(-2.0, 2.0)
         self.angle = random.randint(0, 360)
         self.rotation_speed = random.uniform(-2.0, 2.0)
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
         
-        if image_surface:
+        self.atlas = atlas if image_surface else None
+        self.image_key = image_key
+        if image_surface and atlas:
+            self.original_surface = atlas.scaled(image_key, image_surface, self.size)
+        elif image_surface:
             self.original_surface = pygame.transform.smoothscale(image_surface, (self.size, self.size))
         else:
-            self.original_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-            color = (random.randint(50, 255), random.randint(50, 255), random.randint(50, 255))
-            alpha = random.randint(80, 160)
-            if random.choice([True, False]):
-                pygame.draw.circle(self.original_surface, (*color, alpha), (self.size//2, self.size//2), self.size//2)
-            else:
-                points = [(self.size//2, 0), (self.size, self.size//2), (self.size//2, self.size), (0, self.size//2)]
-                pygame.draw.polygon(self.original_surface, (*color, alpha), points)
+            self.original_surface = make_fallback_surface(self.size)
 
     def update(self):
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
         self.y += self.speed_y
         self.x += self.speed_x
         self.angle = (self.angle + self.rotation_speed) % 360
@@ -47,10 +146,16 @@ class FloatingSprite:
             self.x = self.screen_width - (self.size // 2)
             self.speed_x *= -1
 
-    def draw(self, surface):
-        rotated_surface = pygame.transform.rotate(self.original_surface, self.angle)
-        rect = rotated_surface.get_rect(center=(int(self.x), int(self.y)))
-        surface.blit(rotated_surface, rect.topleft)
+    def draw(self, surface, alpha=1.0):
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        angle = (self.prev_angle + self.rotation_speed * alpha) % 360
+        if self.atlas:
+            rotated_surface = self.atlas.frame(self.image_key, self.original_surface, angle)
+        else:
+            rotated_surface = pygame.transform.rotate(self.original_surface, angle)
+        rect = rotated_surface.get_rect(center=(int(x), int(y)))
+        return surface.blit(rotated_surface, rect.topleft)
 
     def is_off_screen(self):
         if self.moving_up and self.y < -self.size * 2:
@@ -60,17 +165,41 @@ class FloatingSprite:
         return False
 
 class SpriteManager:
-    def __init__(self, width, height, enabled=True, asset_folder="assets"):
+    def __init__(self, width, height, enabled=True, asset_folder="assets",
+                 rotation_step=5, atlas_max_bytes=32 * 1024 * 1024, exact_rotation=False, swarm_size=0,
+                 image_cache_dir=None):
         self.enabled = enabled
         self.width = width
         self.height = height
-        self.sprites = []
+        self.sprites = EntityPool(lambda: FloatingSprite(self.width, self.height))
         self.spawn_chance = 0.01  
         self.max_sprites = 5
         self.loaded_images = []
-        self.load_assets(asset_folder)
+        self.image_hashes = []
+        # The atlas keeps the scaled bases in memory; the cache only spares
+        # later launches the resample, when given a directory.
+        self.image_cache = ImageCache(image_cache_dir, max_bytes=0)
+        self.exact_rotation = exact_rotation
+        self.atlas = RotationAtlas(step=rotation_step, max_bytes=atlas_max_bytes, scaler=self.scale_image)
+        self.asset_folder = asset_folder
+        self.assets_loaded = False
+        self.pending_assets = []
+        self.swarm_size = swarm_size
+        self.swarm = None
         logger.info(f"SpriteManager initialized. Enabled: {self.enabled}")
 
+    def ensure_assets(self):
+        # Decoding starts on the first enabled update; sprites use fallback
+        # shapes until images arrive, so this never holds up a frame.
+        if self.assets_loaded:
+            self.collect_assets()
+            return
+        self.assets_loaded = True
+        with startup.phase("sprite assets"):
+            self.load_assets(self.asset_folder)
+        if self.swarm_size:
+            self.create_swarm(self.swarm_size)
+
     def load_assets(self, folder_name):
         base_dir = os.path.dirname(os.path.abspath(__file__))
         asset_dir = os.path.join(base_dir, folder_name)
@@ -81,33 +210,102 @@ class SpriteManager:
             except Exception as e:
                 logger.error(f"Could not create asset directory: {e}")
                 return
-        png_files = glob.glob(os.path.join(asset_dir, "*.png"))
-        for file_path in png_files:
+        png_files = sorted(glob.glob(os.path.join(asset_dir, "*.png")))
+        if not png_files:
+            logger.info("No .png files found. Using fallback shapes.")
+            return
+        pool = ThreadPoolExecutor(max_workers=ASSET_WORKERS, thread_name_prefix="sprite-assets")
+        self.pending_assets = [(path, pool.submit(self.decode_asset, path)) for path in png_files]
+        # Workers exit once the queue drains; nothing here waits for them.
+        pool.shutdown(wait=False)
+
+    def collect_assets(self, limit=ASSETS_PER_FRAME):
+        """Hand decoded images to the main thread, at most ``limit`` per call."""
+        if not self.pending_assets:
+            return
+        collected = 0
+        still_pending = []
+        for file_path, future in self.pending_assets:
+            if collected >= limit or not future.done():
+                still_pending.append((file_path, future))
+                continue
+            collected += 1
             try:
-                img = pygame.image.load(file_path).convert_alpha()
-                self.loaded_images.append(img)
+                image, image_hash = future.result()
+                self.loaded_images.append(image.convert_alpha())
+                self.image_hashes.append(image_hash)
                 logger.info(f"Loaded sprite asset: {os.path.basename(file_path)}")
             except Exception as e:
                 logger.error(f"Failed to load image {file_path}: {e}")
-        if not self.loaded_images:
-            logger.info("No .png files found. Using fallback shapes.")
+        self.pending_assets = still_pending
+        if collected and self.swarm is not None and self.loaded_images:
+            self.swarm.set_images(self.loaded_images)
+        if not self.pending_assets and not self.loaded_images:
+            logger.info("No sprite assets could be loaded. Using fallback shapes.")
+
+    def decode_asset(self, file_path):
+        # Runs on a loader thread.
+        return pygame.image.load(file_path), self.image_cache.file_hash(file_path)
+
+    def scale_image(self, image_key, image_surface, size):
+        # Loaded assets go through the shared image cache; generated shapes are random anyway.
+        if isinstance(image_key, int) and image_key < len(self.image_hashes):
+            return scaled_surface(self.image_cache, self.image_hashes[image_key], image_surface, (size, size))
+        return smoothscale(image_key, image_surface, size)
+
+    def wait_for_assets(self, timeout=None):
+        # For tools that need every image up front rather than progressively.
+        self.ensure_assets()
+        wait([future for _, future in self.pending_assets], timeout=timeout)
+        self.collect_assets(limit=len(self.pending_assets))
+
+    def create_swarm(self, capacity):
+        try:
+            from .sprite_swarm import SpriteSwarm
+        except ImportError as e:
+            logger.warning(f"FX storm needs NumPy ({e}); using regular sprites.")
+            return
+        # Every asset/size/angle combination stays resident, so give the atlas room.
+        self.atlas.max_bytes = max(self.atlas.max_bytes, SWARM_ATLAS_BYTES)
+        self.swarm = SpriteSwarm(self.width, self.height, capacity, self.loaded_images, self.atlas)
+        logger.info(f"FX storm enabled with up to {capacity} sprites.")
 
     def toggle(self):
         self.enabled = not self.enabled
 
+    def set_exact_rotation(self, exact):
+        self.exact_rotation = exact
+        if exact:
+            for sprite in self.sprites:
+                sprite.atlas = None
+            self.atlas.clear()
+
+    def create_sprite(self):
+        if not self.loaded_images:
+            return self.sprites.acquire()
+        image_key = random.randrange(len(self.loaded_images))
+        atlas = None if self.exact_rotation else self.atlas
+        return self.sprites.acquire(self.loaded_images[image_key], atlas, image_key)
+
     def update(self):
         if not self.enabled:
             return
+        self.ensure_assets()
+        if self.swarm is not None:
+            self.swarm.update()
+            return
         if len(self.sprites) < self.max_sprites and random.random() < self.spawn_chance:
-            img_to_use = random.choice(self.loaded_images) if self.loaded_images else None
-            self.sprites.append(FloatingSprite(self.width, self.height, image_surface=img_to_use))
-        for sprite in self.sprites[:]:
+            self.create_sprite()
+        sprites = self.sprites.items
+        for i in range(len(sprites) - 1, -1, -1):
+            sprite = sprites[i]
             sprite.update()
             if sprite.is_off_screen():
-                self.sprites.remove(sprite)
+                self.sprites.release(sprite)
 
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
         if not self.enabled:
-            return
-        for sprite in self.sprites:
-            sprite.draw(surface)
+            return []
+        if self.swarm is not None:
+            return self.swarm.draw(surface, alpha)
+        return [sprite.draw(surface, alpha) for sprite in self.sprites]
@@ -0,0 +1,174 @@
+import numpy as np
+from loguru import logger
+
+from .sprite_manager import make_fallback_surface
+
+SWARM_SIZES = (40, 50, 60, 70, 80, 90)
+FALLBACK_SHAPES = 6
+# Each blit blends a sprite of up to 130 px, about 20 us apiece on a slow
+# machine, so 500 already take two thirds of a 60 fps frame there. Larger
+# swarms are capped to this.
+MAX_DRAWN = 500
+
+class SpriteSwarm:
+    """Struct-of-arrays FloatingSprite population for large sprite counts.
+
+    Every attribute of a FloatingSprite lives in a NumPy array; update, edge
+    bounces and culling run as whole-array operations. Drawing looks up each
+    sprite's rotated frame and position with array indexing and hands them
+    to a single ``Surface.blits`` call. Live sprites always occupy
+    ``[:count]``. At most ``max_drawn`` sprites are simulated, so every
+    sprite on screen is drawn.
+    """
+
+    def __init__(self, width, height, capacity, images, atlas, seed=None, max_drawn=MAX_DRAWN):
+        if capacity > max_drawn:
+            logger.warning(f"FX storm capped at {max_drawn} sprites, the most drawn per frame "
+                           f"(asked for {capacity})")
+            capacity = max_drawn
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.atlas = atlas
+        self.rng = np.random.default_rng(seed)
+        self.spawn_per_tick = max(1, capacity // 120)
+        self.count = 0
+
+        self.set_images(images)
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.speed_x = np.zeros(capacity)
+        self.speed_y = np.zeros(capacity)
+        self.angle = np.zeros(capacity)
+        self.prev_angle = np.zeros(capacity)
+        self.rotation_speed = np.zeros(capacity)
+        self.size_index = np.zeros(capacity, dtype=np.intp)
+        self.size = np.zeros(capacity)
+        self.image_index = np.zeros(capacity, dtype=np.intp)
+        self.moving_up = np.zeros(capacity, dtype=bool)
+        self.arrays = (
+            self.x, self.y, self.prev_x, self.prev_y, self.speed_x, self.speed_y,
+            self.angle, self.prev_angle, self.rotation_speed, self.size_index,
+            self.size, self.image_index, self.moving_up,
+        )
+
+    def set_images(self, images):
+        # Image assets share atlas entries with FloatingSprite (same keys);
+        # generated fallback shapes get keys of their own.
+        if images:
+            self.sources = list(images)
+            self.source_keys = list(range(len(images)))
+        else:
+            self.sources = [make_fallback_surface(max(SWARM_SIZES)) for _ in range(FALLBACK_SHAPES)]
+            self.source_keys = [("swarm-shape", i) for i in range(FALLBACK_SHAPES)]
+        self.bases = [
+            [self.atlas.scaled(key, source, size) for size in SWARM_SIZES]
+            for key, source in zip(self.source_keys, self.sources)
+        ]
+        # Rotated frames by key (see draw), filled in as sprites first need them.
+        slots = len(self.sources) * len(SWARM_SIZES) * self.atlas.frame_count
+        self.frames = [None] * slots
+        self.half_width = np.full(slots, -1, dtype=np.intp)
+        self.half_height = np.zeros(slots, dtype=np.intp)
+        if self.count:
+            # Live sprites may point at shapes that are gone; re-deal them.
+            self.image_index[:self.count] = self.rng.integers(0, len(self.sources), self.count)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, n):
+        n = min(n, self.capacity - self.count)
+        if n <= 0:
+            return
+        rng = self.rng
+        s = slice(self.count, self.count + n)
+        self.size_index[s] = rng.integers(0, len(SWARM_SIZES), n)
+        size = np.asarray(SWARM_SIZES, dtype=float)[self.size_index[s]]
+        self.size[s] = size
+        self.x[s] = rng.uniform(size, self.width - size)
+        up = rng.random(n) < 0.5
+        self.moving_up[s] = up
+        self.y[s] = np.where(up, self.height + size, -size)
+        self.speed_y[s] = rng.uniform(1.0, 3.0, n) * np.where(up, -1.0, 1.0)
+        self.speed_x[s] = rng.uniform(-2.0, 2.0, n)
+        self.angle[s] = rng.integers(0, 360, n)
+        self.rotation_speed[s] = rng.uniform(-2.0, 2.0, n)
+        self.image_index[s] = rng.integers(0, len(self.sources), n)
+        self.prev_x[s] = self.x[s]
+        self.prev_y[s] = self.y[s]
+        self.prev_angle[s] = self.angle[s]
+        self.count += n
+
+    def update(self):
+        if self.count < self.capacity:
+            self.spawn(self.spawn_per_tick)
+        n = self.count
+        if not n:
+            return
+        x, y, angle = self.x[:n], self.y[:n], self.angle[:n]
+        speed_x, half = self.speed_x[:n], self.size[:n] // 2
+
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        self.prev_angle[:n] = angle
+        y += self.speed_y[:n]
+        x += speed_x
+        np.mod(angle + self.rotation_speed[:n], 360, out=angle)
+
+        left = x <= half
+        right = x >= self.width - half
+        x[left] = half[left]
+        x[right] = self.width - half[right]
+        speed_x[left | right] *= -1
+
+        size = self.size[:n]
+        up = self.moving_up[:n]
+        off = (up & (y < -size * 2)) | (~up & (y > self.height + size * 2))
+        if off.any():
+            keep = np.flatnonzero(~off)
+            for array in self.arrays:
+                array[:len(keep)] = array[:n][keep]
+            self.count = len(keep)
+
+    def load_frame(self, key):
+        rest, index = divmod(key, self.atlas.frame_count)
+        image, size_index = divmod(rest, len(SWARM_SIZES))
+        frame = self.atlas.frame(self.source_keys[image], self.bases[image][size_index],
+                                 index * self.atlas.step)
+        self.frames[key] = frame
+        self.half_width[key] = frame.get_width() // 2
+        self.half_height[key] = frame.get_height() // 2
+
+    def draw(self, surface, alpha=1.0):
+        n = self.count
+        if not n:
+            return []
+        x = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+        y = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        # A rotated frame is at most size * sqrt(2) wide, so size is a safe margin.
+        size = self.size[:n]
+        drawn = np.flatnonzero((x > -size) & (x < self.width + size) &
+                               (y > -size) & (y < self.height + size))
+        if not len(drawn):
+            return []
+        angle = np.mod(self.prev_angle[drawn] + self.rotation_speed[drawn] * alpha, 360)
+
+        frame_count = self.atlas.frame_count
+        frame_index = np.rint(angle / self.atlas.step).astype(np.intp) % frame_count
+        keys = (self.image_index[drawn] * len(SWARM_SIZES) + self.size_index[drawn]) * frame_count + frame_index
+        missing = keys[self.half_width[keys] < 0]
+        if len(missing):
+            for key in np.unique(missing).tolist():
+                self.load_frame(key)
+
+        left = x[drawn].astype(np.intp) - self.half_width[keys]
+        top = y[drawn].astype(np.intp) - self.half_height[keys]
+        frames = map(self.frames.__getitem__, keys.tolist())
+        return surface.blits(zip(frames, zip(left.tolist(), top.tolist())))
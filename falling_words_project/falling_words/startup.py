@@ -0,0 +1,30 @@
+import time
+from contextlib import contextmanager
+from loguru import logger
+
+class StartupTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []
+        self.reported = False
+
+    @contextmanager
+    def phase(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - begin
+            self.phases.append((name, elapsed))
+            if self.reported:
+                logger.debug(f"Lazy init [{name}]: {elapsed * 1000:.1f} ms")
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        total = time.perf_counter() - self.start
+        lines = [f"  {name:<16}{elapsed * 1000:8.1f} ms" for name, elapsed in self.phases]
+        logger.info("Startup timing (to first frame):\n" + "\n".join(lines) + f"\n  {'total':<16}{total * 1000:8.1f} ms")
+
+startup = StartupTimer()
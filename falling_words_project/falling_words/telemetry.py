@@ -0,0 +1,373 @@
+"""Keystroke telemetry: one file of typing records per game session.
+
+Summarize any number of session files by level:
+
+    python -m falling_words.telemetry DIR_OR_FILE [...] [--sessions]
+"""
+import argparse
+import atexit
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from loguru import logger
+
+# Records in the ring. A power of two, so a record's slot is head & (capacity - 1).
+CAPACITY = 4096
+FLUSH_SECONDS = 1.0
+FILE_SUFFIX = ".fwkeys"
+
+MAGIC = b"FWKEYS\x00\x00"
+VERSION = 1
+# magic, version, header length
+PREAMBLE = struct.Struct("<8sII")
+# records in the chunk; each column follows in COLUMNS order
+CHUNK = struct.Struct("<I")
+COLUMNS = (("time", "I"), ("kind", "B"), ("value", "H"), ("extra", "I"))
+RECORD_BYTES = sum(array(code).itemsize for _, code in COLUMNS)
+
+KEY, BACKSPACE, HIT, MISS, CLEAR, END = range(1, 7)
+
+# Gaps longer than this are pauses, not typing rhythm.
+IDLE_MS = 5000
+HISTOGRAM_MS = 10
+HISTOGRAM_BUCKETS = 200
+PARALLEL_FILES = 200
+
+class KeystrokeTelemetry:
+    """Keystrokes from Game.handle_input, written to one file per game session.
+
+    ``record`` stores four numbers into preallocated arrays and bumps a
+    counter, nothing else. A background thread copies new records out of the
+    ring every FLUSH_SECONDS and appends them to the session file as one chunk
+    per column. If it ever falls a whole ring behind, the oldest unwritten
+    records are dropped and counted instead of holding up the game.
+
+    Record kinds, with what goes in their value and extra columns:
+        KEY        code point of the character typed
+        BACKSPACE  -
+        HIT        length of the word cleared, ms it was on screen
+        MISS       length of the input that matched nothing
+        CLEAR      length of the input cleared with Ctrl+K
+        END        final score, words missed
+    Times are ms since the session started. Nothing is recorded unless a
+    ``directory`` is given.
+    """
+
+    def __init__(self, directory=None, player="player", capacity=CAPACITY):
+        if capacity & (capacity - 1):
+            raise ValueError(f"Telemetry capacity must be a power of two, got {capacity}")
+        self.directory = directory
+        self.enabled = directory is not None
+        self.player = player
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.columns = [array(code, bytes(array(code).itemsize * capacity)) for _, code in COLUMNS]
+        self.times, self.kinds, self.values, self.extras = self.columns
+        self.head = 0
+        self.session_start = time.perf_counter()
+        # Written by the flusher thread only.
+        self.flushed = 0
+        self.dropped = 0
+        self.header = None
+        self.file = None
+        self.files_written = 0
+        self.sessions = queue.Queue()
+        self.stop = threading.Event()
+        self.flusher = None
+        if self.enabled:
+            self.flusher = threading.Thread(target=self._flush_loop, name="telemetry-flush", daemon=True)
+            self.flusher.start()
+            atexit.register(self.close)
+
+    def start_session(self, level, difficulty):
+        if not self.enabled:
+            return
+        self.session_start = time.perf_counter()
+        # Records before this head belong to the previous session.
+        self.sessions.put((self.head, {
+            "player": self.player, "level": level, "difficulty": difficulty, "started": time.time(),
+        }))
+
+    def record(self, kind, value=0, extra=0):
+        if not self.enabled:
+            return
+        slot = self.head & self.mask
+        self.times[slot] = int((time.perf_counter() - self.session_start) * 1000)
+        self.kinds[slot] = kind
+        self.values[slot] = value
+        self.extras[slot] = extra
+        # Bumped last: the flusher only reads slots below head.
+        self.head += 1
+
+    def close(self):
+        if self.flusher is None or self.stop.is_set():
+            return
+        self.stop.set()
+        self.flusher.join()
+        if self.dropped:
+            logger.warning(f"Telemetry dropped {self.dropped} keystrokes; the flusher fell behind")
+        logger.info(f"Telemetry: {self.files_written} session files in {self.directory}")
+        atexit.unregister(self.close)
+
+    def _flush_loop(self):
+        while not self.stop.wait(FLUSH_SECONDS):
+            self._flush()
+        self._flush()
+        self._close_file()
+
+    def _flush(self):
+        while True:
+            try:
+                end, header = self.sessions.get_nowait()
+            except queue.Empty:
+                break
+            self._write_until(end)
+            self._close_file()
+            self.header = header
+        self._write_until(self.head)
+
+    def _write_until(self, end):
+        start = self.flushed
+        if end - start > self.capacity:
+            self.dropped += end - start - self.capacity
+            start = end - self.capacity
+        count = end - start
+        self.flushed = end
+        if count <= 0:
+            return
+        first = start & self.mask
+        if first + count <= self.capacity:
+            chunk = [column[first:first + count] for column in self.columns]
+        else:
+            wrapped = first + count - self.capacity
+            chunk = [column[first:] + column[:wrapped] for column in self.columns]
+        # The game may have lapped the ring while the slices were taken.
+        overwritten = self.head - self.capacity - start
+        if overwritten > 0:
+            self.dropped += min(overwritten, count)
+            chunk = [column[overwritten:] for column in chunk]
+            count -= min(overwritten, count)
+        if count and self.header is not None:
+            self._write_chunk(count, chunk)
+
+    def _write_chunk(self, count, chunk):
+        try:
+            if self.file is None:
+                self._open_file()
+            self.file.write(CHUNK.pack(count))
+            for column in chunk:
+                self.file.write(column.tobytes())
+            self.file.flush()
+        except OSError as e:
+            logger.warning(f"Could not write telemetry: {e}")
+            self._close_file()
+            # Skip the rest of this session rather than leave a gap in it.
+            self.header = None
+
+    def _open_file(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.header["started"]))
+        path = os.path.join(self.directory, f"{stamp}-{os.getpid()}-{self.files_written}{FILE_SUFFIX}")
+        header = json.dumps(self.header).encode("utf-8")
+        self.file = open(path, "wb")
+        self.file.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        self.file.write(header)
+        self.files_written += 1
+
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def read_session(path):
+    """The header and record columns (name -> array) of one session file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, header_length = PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} telemetry file")
+    position = PREAMBLE.size
+    header = json.loads(data[position:position + header_length])
+    position += header_length
+    columns = {name: array(code) for name, code in COLUMNS}
+    while position + CHUNK.size <= len(data):
+        (count,) = CHUNK.unpack_from(data, position)
+        position += CHUNK.size
+        if position + count * RECORD_BYTES > len(data):
+            # A chunk cut short by a crash.
+            break
+        for name, _ in COLUMNS:
+            column = columns[name]
+            size = count * column.itemsize
+            column.frombytes(data[position:position + size])
+            position += size
+    return header, columns
+
+def summarize_session(path):
+    """Totals for one session file, in a form that adds up across sessions; None if unreadable."""
+    try:
+        header, columns = read_session(path)
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning(f"Skipping {path}: {e}")
+        return None
+    summary = {
+        "path": path, "player": header.get("player"), "level": header.get("level"),
+        "difficulty": header.get("difficulty"), "started": header.get("started"),
+        "keys": 0, "hits": 0, "misses": 0, "clears": 0, "backspaces": 0, "bursts": 0, "longest_burst": 0,
+        "word_chars": 0, "on_screen_ms": 0, "intervals": 0, "interval_ms": 0, "active_ms": 0,
+        "histogram": [0] * HISTOGRAM_BUCKETS, "score": None, "missed": None,
+    }
+    histogram = summary["histogram"]
+    first = previous = None
+    burst = 0
+    for t, kind, value, extra in zip(columns["time"], columns["kind"], columns["value"], columns["extra"]):
+        if kind == END:
+            summary["score"], summary["missed"] = value, extra
+            continue
+        summary["keys"] += 1
+        if previous is None:
+            first = t
+        else:
+            gap = t - previous
+            if gap < IDLE_MS:
+                summary["intervals"] += 1
+                summary["interval_ms"] += gap
+                histogram[min(gap // HISTOGRAM_MS, HISTOGRAM_BUCKETS - 1)] += 1
+        previous = t
+        if kind == BACKSPACE:
+            summary["backspaces"] += 1
+            burst += 1
+            continue
+        if burst:
+            summary["bursts"] += 1
+            summary["longest_burst"] = max(summary["longest_burst"], burst)
+            burst = 0
+        if kind == HIT:
+            summary["hits"] += 1
+            summary["word_chars"] += value
+            summary["on_screen_ms"] += extra
+        elif kind == MISS:
+            summary["misses"] += 1
+        elif kind == CLEAR:
+            summary["clears"] += 1
+    if burst:
+        summary["bursts"] += 1
+        summary["longest_burst"] = max(summary["longest_burst"], burst)
+    if first is not None:
+        summary["active_ms"] = previous - first
+    summary["wpm"] = wpm(summary["word_chars"], summary["active_ms"])
+    return summary
+
+def wpm(word_chars, active_ms):
+    # Five characters per word, counting only words that were cleared.
+    return word_chars / 5 / (active_ms / 60000) if active_ms > 0 else 0.0
+
+def histogram_percentile(histogram, fraction):
+    total = sum(histogram)
+    if not total:
+        return 0
+    running = 0
+    for bucket, count in enumerate(histogram):
+        running += count
+        if running >= fraction * total:
+            return (bucket + 1) * HISTOGRAM_MS
+    return len(histogram) * HISTOGRAM_MS
+
+def aggregate(summaries):
+    """Per-level totals (plus "ALL") from session summaries."""
+    levels = {}
+    for summary in summaries:
+        for level in (summary["level"], "ALL"):
+            totals = levels.get(level)
+            if totals is None:
+                totals = levels[level] = {
+                    "sessions": 0, "session_wpms": [], "histogram": [0] * HISTOGRAM_BUCKETS,
+                    "keys": 0, "hits": 0, "misses": 0, "backspaces": 0, "bursts": 0, "longest_burst": 0,
+                    "word_chars": 0, "on_screen_ms": 0, "intervals": 0, "interval_ms": 0, "active_ms": 0,
+                }
+            totals["sessions"] += 1
+            totals["session_wpms"].append(summary["wpm"])
+            for name in ("keys", "hits", "misses", "backspaces", "bursts", "word_chars",
+                         "on_screen_ms", "intervals", "interval_ms", "active_ms"):
+                totals[name] += summary[name]
+            totals["longest_burst"] = max(totals["longest_burst"], summary["longest_burst"])
+            histogram = totals["histogram"]
+            for bucket, count in enumerate(summary["histogram"]):
+                histogram[bucket] += count
+    return levels
+
+def session_paths(sources):
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, names in os.walk(source):
+                paths.extend(os.path.join(root, name) for name in names if name.endswith(FILE_SUFFIX))
+        else:
+            paths.append(source)
+    return sorted(paths)
+
+def summarize_all(paths, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if len(paths) < PARALLEL_FILES or workers == 1:
+        return [summary for summary in map(summarize_session, paths) if summary is not None]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [summary for summary in executor.map(summarize_session, paths, chunksize=64) if summary is not None]
+
+def print_sessions(summaries):
+    print(f"{'started':<20}{'level':<16}{'difficulty':<12}{'keys':>6}{'wpm':>7}{'hit%':>7}{'bursts':>8}{'score':>7}")
+    for summary in summaries:
+        attempts = summary["hits"] + summary["misses"]
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(summary["started"] or 0))
+        score = "-" if summary["score"] is None else summary["score"]
+        print(f"{started:<20}{str(summary['level'])[:15]:<16}{str(summary['difficulty']):<12}{summary['keys']:>6}"
+              f"{summary['wpm']:>7.1f}{summary['hits'] / attempts * 100 if attempts else 0:>7.1f}"
+              f"{summary['bursts']:>8}{score:>7}")
+
+def print_levels(levels):
+    print(f"{'level':<16}{'sessions':>9}{'keys':>9}{'wpm':>7}{'med wpm':>9}{'key ms':>8}{'p50':>6}{'p90':>6}"
+          f"{'word ms':>9}{'hit%':>7}{'bursts/100w':>13}{'burst len':>11}")
+    for level in sorted(levels, key=lambda name: (name == "ALL", str(name))):
+        totals = levels[level]
+        wpms = sorted(totals["session_wpms"])
+        attempts = totals["hits"] + totals["misses"]
+        print(f"{str(level)[:15]:<16}{totals['sessions']:>9}{totals['keys']:>9}"
+              f"{wpm(totals['word_chars'], totals['active_ms']):>7.1f}{wpms[len(wpms) // 2]:>9.1f}"
+              f"{totals['interval_ms'] / totals['intervals'] if totals['intervals'] else 0:>8.0f}"
+              f"{histogram_percentile(totals['histogram'], 0.5):>6}{histogram_percentile(totals['histogram'], 0.9):>6}"
+              f"{totals['on_screen_ms'] / totals['hits'] if totals['hits'] else 0:>9.0f}"
+              f"{totals['hits'] / attempts * 100 if attempts else 0:>7.1f}"
+              f"{totals['bursts'] / totals['hits'] * 100 if totals['hits'] else 0:>13.1f}"
+              f"{totals['backspaces'] / totals['bursts'] if totals['bursts'] else 0:>11.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="falling-words-telemetry",
+                                     description="Summarize keystroke telemetry by level.")
+    parser.add_argument("sources", nargs="+",
+                        help="session files, or directories of them such as the game's --telemetry DIR")
+    parser.add_argument("--player", help="only sessions played by this name")
+    parser.add_argument("--sessions", action="store_true", help="also print one line per session")
+    parser.add_argument("--workers", type=int, help="processes to read files with (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    paths = session_paths(args.sources)
+    start = time.perf_counter()
+    summaries = summarize_all(paths, args.workers)
+    if args.player is not None:
+        summaries = [summary for summary in summaries if summary["player"] == args.player]
+    if not summaries:
+        print(f"No telemetry sessions found in {', '.join(args.sources)}")
+        return
+    summaries.sort(key=lambda summary: summary["started"] or 0)
+    if args.sessions:
+        print_sessions(summaries)
+        print()
+    print_levels(aggregate(summaries))
+    print(f"\n{len(summaries)} sessions from {len(paths)} files in {time.perf_counter() - start:.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+from array import array
+from loguru import logger
+
+MAGIC = b"FWCORPUS"
+VERSION = 1
+# magic, version, header length
+PREAMBLE = struct.Struct("<8sII")
+
+class LevelView:
+    """Read-only sequence of one level's words, decoded on access."""
+
+    def __init__(self, corpus, start, end):
+        self.corpus = corpus
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("level word index out of range")
+        return self.corpus.word(self.start + index)
+
+    def __iter__(self):
+        for i in range(self.start, self.end):
+            yield self.corpus.word(i)
+
+class WordCorpus:
+    """Memory-mapped, compiled form of words_config.json.
+
+    Layout: preamble, JSON header (levels, per-length index), 8-byte aligned
+    native-endian uint64 offsets (one per word plus an end marker), then the
+    UTF-8 string table. Each level's words are stored contiguously and sorted
+    by length, so a level, or a level restricted to a length range, is one
+    index range.
+    """
+
+    def __init__(self, path, delete_on_close=False):
+        self.path = path
+        self.delete_on_close = delete_on_close
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = PREAMBLE.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} word corpus")
+        header_start = PREAMBLE.size
+        self.header = json.loads(self.map[header_start:header_start + header_length])
+        self.count = self.header["count"]
+        offsets_start = _align(header_start + header_length)
+        offsets_end = offsets_start + 8 * (self.count + 1)
+        self.offsets = memoryview(self.map)[offsets_start:offsets_end].cast("Q")
+        self.strings_start = offsets_end
+        self.levels = {level["name"]: level for level in self.header["levels"]}
+        self.level_names = [level["name"] for level in self.header["levels"]]
+        self.default_level = self.header.get("default_level", "")
+
+    def close(self):
+        if getattr(self, "offsets", None) is not None:
+            self.offsets.release()
+            self.offsets = None
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
+        if self.delete_on_close:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Could not remove {self.path}: {e}")
+
+    def word(self, index):
+        begin = self.strings_start + self.offsets[index]
+        end = self.strings_start + self.offsets[index + 1]
+        return self.map[begin:end].decode("utf-8")
+
+    def level(self, name):
+        level = self.levels[name]
+        return LevelView(self, level["start"], level["end"])
+
+    def length_range(self, name, min_length=None, max_length=None):
+        """Index range [start, end) of a level's words with min_length <= len <= max_length."""
+        level = self.levels[name]
+        return length_range(level["lengths"], level["length_starts"], level["start"], level["end"],
+                            min_length, max_length)
+
+    def matches_source(self, source_path):
+        stat = os.stat(source_path)
+        return (self.header.get("source_mtime_ns") == stat.st_mtime_ns and
+                self.header.get("source_size") == stat.st_size)
+
+def length_range(lengths, length_starts, start, end, min_length=None, max_length=None):
+    """Narrow [start, end) of words sorted by length to min_length <= len <= max_length.
+
+    lengths holds the distinct lengths in order and length_starts the index
+    where each one begins.
+    """
+    if min_length is not None:
+        i = bisect.bisect_left(lengths, min_length)
+        start = length_starts[i] if i < len(lengths) else end
+    if max_length is not None:
+        i = bisect.bisect_right(lengths, max_length)
+        end = length_starts[i] if i < len(lengths) else end
+    return start, max(start, end)
+
+def index_lengths(words):
+    """Distinct lengths and where each begins, for words sorted by length."""
+    lengths, length_starts = [], []
+    for i, word in enumerate(words):
+        if not lengths or len(word) != lengths[-1]:
+            lengths.append(len(word))
+            length_starts.append(i)
+    return lengths, length_starts
+
+def _align(position):
+    return (position + 7) & ~7
+
+def compile_corpus(levels, output_path, default_level="", source_path=None):
+    strings = bytearray()
+    offsets = [0]
+    header_levels = []
+    for name, words in levels.items():
+        start = len(offsets) - 1
+        words = sorted(words, key=len)
+        lengths, length_starts = index_lengths(words)
+        for word in words:
+            strings += word.encode("utf-8")
+            offsets.append(len(strings))
+        header_levels.append({
+            "name": name, "start": start, "end": len(offsets) - 1,
+            "lengths": lengths, "length_starts": [start + i for i in length_starts],
+        })
+
+    header = {"count": len(offsets) - 1, "default_level": default_level, "levels": header_levels}
+    if source_path is not None:
+        stat = os.stat(source_path)
+        header["source_mtime_ns"] = stat.st_mtime_ns
+        header["source_size"] = stat.st_size
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (_align(f.tell()) - f.tell()))
+        f.write(array("Q", offsets).tobytes())
+        f.write(strings)
+    os.replace(tmp_path, output_path)
+    logger.info(f"Compiled {header['count']} words in {len(levels)} levels to {output_path}")
+
+def validate_config(data):
+    if not isinstance(data, dict):
+        raise ValueError("word configuration must be a JSON object")
+    levels = data.get("levels")
+    if not isinstance(levels, dict) or not levels:
+        raise ValueError('"levels" must be a non-empty object')
+    for name, words in levels.items():
+        if not isinstance(words, list) or not words:
+            raise ValueError(f'level "{name}" must be a non-empty list of words')
+        for word in words:
+            if not isinstance(word, str) or not word:
+                raise ValueError(f'level "{name}" contains an invalid word: {word!r}')
+    default_level = data.get("default_level", "")
+    if default_level and default_level not in levels:
+        raise ValueError(f'default_level "{default_level}" is not one of the levels')
+
+def build_corpus(config_path, corpus_path):
+    """Parse, validate and compile config_path; safe to run in a worker process."""
+    with open(config_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    validate_config(data)
+    compile_corpus(data["levels"], corpus_path,
+                   default_level=data.get("default_level", ""), source_path=config_path)
+
+def load_corpus(config_path, corpus_path=None):
+    """Open the compiled corpus for config_path, rebuilding it if the JSON changed."""
+    corpus_path = corpus_path or os.path.splitext(config_path)[0] + ".corpus"
+    if os.path.exists(corpus_path):
+        try:
+            corpus = WordCorpus(corpus_path)
+            try:
+                if corpus.matches_source(config_path):
+                    return corpus
+            except OSError:
+                corpus.close()
+                raise
+            corpus.close()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding word corpus {corpus_path}: {e}")
+
+    build_corpus(config_path, corpus_path)
+    return WordCorpus(corpus_path)
@@ -1,24 +1,56 @@
 import json
+import multiprocessing
 import random
 import os
+import queue
+import tempfile
+import threading
+import time
 from loguru import logger
 
+from .word_corpus import WordCorpus, build_corpus, index_lengths, length_range, load_corpus
+
+RELOAD_POLL_SECONDS = 1.0
+RELOAD_TIMEOUT_SECONDS = 30.0
+# Never fork: the game process already runs audio, score, telemetry and
+# loader threads, and a forked child can inherit one of their locks held.
+SPAWN = multiprocessing.get_context("spawn")
+
+def _compile_in_child(config_path, corpus_path, conn):
+    try:
+        build_corpus(config_path, corpus_path)
+        conn.send(None)
+    except Exception as e:
+        conn.send(str(e))
+    finally:
+        conn.close()
+
 class WordManager:
-    def __init__(self, config_filename="words_config.json"):
+    def __init__(self, config_filename="words_config.json", use_corpus=True):
         self.levels = {}
         self.level_names = []
         self.current_level = ""
+        self.use_corpus = use_corpus
+        self.corpus = None
+        # Plain-list levels sorted by length, for get_word's length filter.
+        self.length_index = {}
+        # Its own generator so a session can be reseeded for recording and replay.
+        self.rng = random.Random()
+        self.watcher = None
+        self.stop_watch = threading.Event()
+        self.reloads = queue.Queue()
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.config_path = os.path.join(base_dir, config_filename)
         self.load_config(self.config_path)
 
     def load_config(self, config_path):
         try:
-            with open(config_path, 'r') as f:
-                data = json.load(f)
-            self.levels = data.get("levels", {})
+            if self.use_corpus:
+                default_level = self.load_from_corpus(config_path)
+            else:
+                default_level = self.load_from_json(config_path)
             self.level_names = list(self.levels.keys())
-            self.set_level(data.get("default_level", ""))
+            self.set_level(default_level)
             logger.info(f"Successfully loaded word configuration from {config_path}")
         except FileNotFoundError:
             logger.error(f"Config file {config_path} not found.")
@@ -30,6 +62,148 @@ class WordManager:
             self.levels = {"default": ["json", "format", "error"]}
             self.level_names = ["default"]
             self.set_level("default")
+        except ValueError as e:
+            logger.error(f"Invalid word configuration in {config_path}: {e}")
+            self.levels = {"default": ["json", "format", "error"]}
+            self.level_names = ["default"]
+            self.set_level("default")
+        self.length_index = {}
+        if self.corpus is None:
+            for name, words in self.levels.items():
+                by_length = sorted(words, key=len)
+                self.length_index[name] = (by_length, *index_lengths(by_length))
+
+    def load_from_json(self, config_path):
+        with open(config_path, 'r') as f:
+            data = json.load(f)
+        self.levels = data.get("levels", {})
+        return data.get("default_level", "")
+
+    def load_from_corpus(self, config_path):
+        try:
+            self.corpus = load_corpus(config_path)
+        except OSError as e:
+            if not os.path.exists(config_path):
+                raise
+            # e.g. a read-only install directory: fall back to plain lists.
+            logger.warning(f"Word corpus unavailable ({e}); loading {config_path} directly.")
+            return self.load_from_json(config_path)
+        self.levels = {name: self.corpus.level(name) for name in self.corpus.level_names}
+        return self.corpus.default_level
+
+    def start_watching(self, interval=RELOAD_POLL_SECONDS):
+        """Reload the config whenever it changes on disk; see apply_reload."""
+        if self.watcher is not None:
+            return
+        # Taken here, not on the thread, so a change made right after this call is seen.
+        signature = self.config_signature()
+        self.watcher = threading.Thread(target=self._watch_loop, args=(interval, signature),
+                                        name="word-config-watcher", daemon=True)
+        self.watcher.start()
+
+    def stop_watching(self):
+        if self.watcher is None:
+            return
+        self.stop_watch.set()
+        self.watcher.join()
+        self.watcher = None
+        while not self.reloads.empty():
+            self.reloads.get_nowait().close()
+
+    def close(self):
+        """Stop watching and release the corpus; a reloaded one also deletes its file."""
+        self.stop_watching()
+        if self.corpus is not None:
+            # The levels are views into the corpus, so they go with it.
+            self.levels = {}
+            self.corpus.close()
+            self.corpus = None
+
+    def config_signature(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _watch_loop(self, interval, last_signature):
+        while not self.stop_watch.wait(interval):
+            signature = self.config_signature()
+            if signature is None or signature == last_signature:
+                continue
+            last_signature = signature
+            corpus_path = None
+            try:
+                # The system temp directory, so a read-only install can still reload.
+                fd, corpus_path = tempfile.mkstemp(prefix="words_config-", suffix=".corpus")
+                os.close(fd)
+                self._compile(corpus_path)
+                corpus = WordCorpus(corpus_path, delete_on_close=True)
+            except Exception as e:
+                # Often a half-written save; the next write changes the signature again.
+                logger.error(f"Not reloading {self.config_path}, keeping current words: {e}")
+                if corpus_path is not None and os.path.exists(corpus_path):
+                    os.remove(corpus_path)
+                continue
+            self.reloads.put(corpus)
+
+    def _compile(self, corpus_path):
+        """Build the corpus in a fresh process, killing it if it hangs.
+
+        Parsing and compiling run in a separate process so a large file never
+        holds the GIL away from the game loop; this thread only stats and maps.
+        A new process per reload means a stuck or crashed one never takes later
+        reloads down with it.
+        """
+        receiver, sender = SPAWN.Pipe(duplex=False)
+        process = SPAWN.Process(target=_compile_in_child, args=(self.config_path, corpus_path, sender),
+                                name="word-config-compile", daemon=True)
+        process.start()
+        sender.close()
+        deadline = time.monotonic() + RELOAD_TIMEOUT_SECONDS
+        try:
+            while not receiver.poll(0.1):
+                if self.stop_watch.is_set():
+                    raise RuntimeError("stopped while compiling")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"compiling took over {RELOAD_TIMEOUT_SECONDS:.0f}s")
+            error = receiver.recv()
+            process.join(1.0)
+        except EOFError:
+            error = "the compiling process exited without a result"
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            receiver.close()
+        if error is not None:
+            raise RuntimeError(error)
+
+    def apply_reload(self):
+        """Swap in a reloaded config, if one is ready. Call between frames.
+
+        Returns True when the levels changed. The current level is kept if it
+        still exists, otherwise the new default level is selected.
+        """
+        corpus = None
+        while not self.reloads.empty():
+            if corpus is not None:
+                corpus.close()
+            corpus = self.reloads.get_nowait()
+        if corpus is None:
+            return False
+
+        previous = self.corpus
+        self.corpus = corpus
+        self.levels = {name: corpus.level(name) for name in corpus.level_names}
+        self.level_names = list(self.levels.keys())
+        if self.current_level not in self.levels:
+            self.current_level = ""
+            self.set_level(corpus.default_level or self.level_names[0])
+        if previous is not None:
+            previous.close()
+        logger.info(f"Reloaded word configuration: {len(self.level_names)} levels, {corpus.count} words")
+        return True
 
     def set_level(self, level_name):
         if level_name in self.levels:
@@ -37,7 +211,21 @@ class WordManager:
         else:
             logger.warning(f"Level '{level_name}' not found.")
 
-    def get_word(self):
+    def get_word(self, min_length=None, max_length=None):
         if not self.levels or not self.current_level:
             return "error"
-        return random.choice(self.levels[self.current_level])
+        words = self.levels[self.current_level]
+        if min_length is None and max_length is None:
+            return self.rng.choice(words)
+
+        if self.corpus is not None and self.current_level in self.corpus.levels:
+            start, end = self.corpus.length_range(self.current_level, min_length, max_length)
+            if start < end:
+                return self.corpus.word(self.rng.randrange(start, end))
+            return self.rng.choice(words)
+
+        by_length, lengths, length_starts = self.length_index[self.current_level]
+        start, end = length_range(lengths, length_starts, 0, len(by_length), min_length, max_length)
+        if start < end:
+            return by_length[self.rng.randrange(start, end)]
+        return self.rng.choice(words)
@@ -0,0 +1,98 @@
+class TrieNode:
+    __slots__ = ("children", "words", "complete")
+
+    def __init__(self):
+        self.children = {}
+        self.words = set()      # on-screen words passing through this prefix
+        self.complete = []      # on-screen words ending here, oldest first
+
+class WordMatcher:
+    """Prefix index over the on-screen words, advanced one keystroke at a time.
+
+    ``highlighted`` is the set of words whose text starts with the typed input
+    and ``match()`` returns the oldest word equal to it, both without scanning
+    the word list. Matching is case-insensitive, like the original linear scan.
+    """
+
+    def __init__(self):
+        self.root = TrieNode()
+        self.path = [self.root]
+        self.input = ""
+        self.dead_chars = 0     # typed characters past the last existing node
+
+    @property
+    def node(self):
+        return None if self.dead_chars else self.path[-1]
+
+    @property
+    def highlighted(self):
+        node = self.node
+        if node is None or node is self.root:
+            return frozenset()
+        return node.words
+
+    @property
+    def prefix_length(self):
+        return len(self.path) - 1
+
+    def add(self, word):
+        node = self.root
+        node.words.add(word)
+        for ch in word.text.lower():
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = TrieNode()
+            child.words.add(word)
+            node = child
+        node.complete.append(word)
+        if self.dead_chars:
+            # A new word may extend the typed prefix past the old dead end.
+            self.set_input(self.input)
+
+    def remove(self, word):
+        # Nodes are kept even when empty so the typing path stays valid; the
+        # trie only ever holds prefixes of words spawned this round.
+        node = self.root
+        node.words.discard(word)
+        for ch in word.text.lower():
+            node = node.children.get(ch)
+            if node is None:
+                return
+            node.words.discard(word)
+        if word in node.complete:
+            node.complete.remove(word)
+
+    def push(self, text):
+        self.input += text
+        for ch in text.lower():
+            child = None if self.dead_chars else self.path[-1].children.get(ch)
+            if child is None:
+                self.dead_chars += 1
+            else:
+                self.path.append(child)
+
+    def pop(self):
+        if not self.input:
+            return
+        removed = self.input[-1]
+        self.input = self.input[:-1]
+        for _ in removed.lower():
+            if self.dead_chars:
+                self.dead_chars -= 1
+            elif len(self.path) > 1:
+                self.path.pop()
+
+    def set_input(self, text):
+        self.clear_input()
+        self.push(text)
+
+    def clear_input(self):
+        self.path = [self.root]
+        self.input = ""
+        self.dead_chars = 0
+
+    def match(self):
+        node = self.node
+        if node is None or node is self.root or not node.complete:
+            return None
+        return node.complete[0]
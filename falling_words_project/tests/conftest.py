@@ -0,0 +1,5 @@
+import os
+
+# Before anything imports pygame: no window, no sound card.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,49 @@
+from falling_words.entity_pool import EntityPool
+from falling_words.simulation import Word
+
+
+def make_pool(count):
+    pool = EntityPool(Word)
+    words = [pool.acquire(0, i, f"w{i}", 1.0) for i in range(count)]
+    return pool, words
+
+
+def assert_dense(pool):
+    for index, entity in enumerate(pool.items):
+        assert entity.pool_index == index
+
+
+def test_release_swaps_last_into_the_gap():
+    pool, words = make_pool(5)
+    pool.release(words[1])
+    assert len(pool) == 4
+    assert pool.items[1] is words[4]
+    assert words[1].pool_index == -1
+    assert_dense(pool)
+
+
+def test_release_last_and_only():
+    pool, words = make_pool(2)
+    pool.release(words[1])
+    pool.release(words[0])
+    assert len(pool) == 0
+    assert pool.free == [words[1], words[0]]
+
+
+def test_reacquire_reuses_and_resets_released_entity():
+    pool, words = make_pool(3)
+    pool.release(words[0])
+    again = pool.acquire(5, 6, "again", 2.0, 100)
+    assert again is words[0]
+    assert (again.x, again.y, again.prev_y, again.text, again.speed, again.spawn_time) == (5, 6, 6, "again", 2.0, 100)
+    assert pool.items[-1] is again
+    assert_dense(pool)
+
+
+def test_clear_recycles_everything():
+    pool, words = make_pool(4)
+    pool.clear()
+    assert len(pool) == 0
+    assert all(word.pool_index == -1 for word in words)
+    assert {id(word) for word in pool.free} == {id(word) for word in words}
+    assert pool.acquire(0, 0, "x", 1.0) in words
@@ -0,0 +1,51 @@
+import threading
+
+from falling_words.image_cache import ImageCache
+
+SIZE = (2, 2)
+PIXELS = bytes(range(16))
+
+
+def get(cache, source_hash="abc"):
+    return cache.get(source_hash, SIZE, "test", lambda: PIXELS, lambda data, size: (data, size))
+
+
+def test_disk_entries_are_reused_by_a_later_cache(tmp_path):
+    first = ImageCache(str(tmp_path))
+    assert get(first) == (PIXELS, SIZE)
+    assert get(first) == (PIXELS, SIZE)
+    assert (first.stats()["misses"], first.stats()["hits"]) == (1, 1)
+
+    second = ImageCache(str(tmp_path), max_bytes=0)
+    assert get(second) == (PIXELS, SIZE)
+    assert get(second) == (PIXELS, SIZE)
+    stats = second.stats()
+    assert (stats["disk_hits"], stats["misses"], stats["entries"]) == (2, 0, 0)
+
+
+def test_without_a_directory_nothing_is_written(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = ImageCache()
+    get(cache)
+    get(cache)
+    assert list(tmp_path.iterdir()) == []
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (1, 1)
+
+
+def test_counts_add_up_across_loader_threads(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=0)
+    image = tmp_path / "image.png"
+    image.write_bytes(b"not really a png")
+
+    def load():
+        for i in range(200):
+            get(cache, cache.file_hash(str(image)) + str(i % 5))
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats["hits"] + stats["disk_hits"] + stats["misses"] == 8 * 200
+    assert len(cache.hashes) == 1
@@ -0,0 +1,70 @@
+import pygame
+import pytest
+
+from falling_words.game import Game
+from falling_words.replay import SessionRecorder, Replay
+
+
+@pytest.fixture
+def make_game(tmp_path):
+    score_managers = []
+
+    def make():
+        game = Game(score_file=str(tmp_path / "scores.json"))
+        game.sprite_manager.enabled = False
+        # Every simulation event, with the tick it came out on.
+        trace = []
+        drain = game.sim.drain_events
+
+        def traced_drain():
+            events = drain()
+            trace.extend((game.ticks, event) for event in events)
+            return events
+
+        game.sim.drain_events = traced_drain
+        # Replay.start detaches the score manager; keep it to close.
+        score_managers.append(game.score_manager)
+        return game, trace
+
+    yield make
+    for score_manager in score_managers:
+        score_manager.close()
+
+
+def key_events(text, backspace=False):
+    events = []
+    if backspace:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_x, mod=0, unicode="x"))
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_BACKSPACE, mod=0, unicode="\b"))
+        events.append(pygame.event.Event(pygame.KEYUP, key=pygame.K_BACKSPACE, mod=0, unicode=""))
+    for ch in text:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=ord(ch.lower()), mod=0, unicode=ch))
+    events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0, unicode=" "))
+    return events
+
+
+def test_replay_reproduces_the_recorded_session(make_game, tmp_path):
+    game, recorded = make_game()
+    recorder = SessionRecorder(game, seed=1234)
+    game.seed(1234)
+    for tick in range(2400):
+        if tick % 50 == 0 and len(game.sim.words) and not game.sim.finished:
+            word = max(game.sim.words, key=lambda w: (w.y, w.text))
+            for event in key_events(word.text, backspace=tick % 150 == 0):
+                recorder.record(game.ticks, event)
+                game.handle_event(event)
+        game.update()
+    path = tmp_path / "session.fwreplay"
+    recorder.save(str(path), game)
+    assert recorded and game.sim.score > 0
+
+    replayed_game, replayed = make_game()
+    replay = Replay(str(path))
+    replay.start(replayed_game)
+    while replayed_game.ticks < replay.ticks:
+        replay.feed(replayed_game)
+        replayed_game.update()
+    replay.feed(replayed_game)
+
+    assert replayed == recorded
+    assert replay.check(replayed_game)
@@ -0,0 +1,69 @@
+import json
+import os
+import time
+
+from falling_words.score_manager import ScoreManager
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_torn_journal_tail_is_ignored_and_compacted_away(tmp_path):
+    scores = tmp_path / "scores.json"
+    scores.write_text(json.dumps({"animals_EASY": {"accuracy": 50.0, "perfect_words": 1}}))
+    journal = tmp_path / "scores.json.journal"
+    journal.write_text(
+        json.dumps({"key": "animals_EASY", "accuracy": 75.0, "perfect_words": 2}) + "\n" +
+        json.dumps({"key": "colors_HARD", "accuracy": 60.0, "perfect_words": 4}) + "\n" +
+        '{"key": "colors_EASY", "accur')
+    manager = ScoreManager(str(scores))
+    try:
+        assert manager.scores == {
+            "animals_EASY": {"accuracy": 75.0, "perfect_words": 2},
+            "colors_HARD": {"accuracy": 60.0, "perfect_words": 4},
+        }
+        # Compacted before anything can be appended after the torn line.
+        assert wait_until(lambda: not journal.exists())
+        assert json.loads(scores.read_text()) == manager.scores
+    finally:
+        manager.close()
+
+
+def test_journal_is_compacted_into_the_score_file(tmp_path):
+    scores = tmp_path / "scores.json"
+    journal = tmp_path / "scores.json.journal"
+    manager = ScoreManager(str(scores), compact_every=3)
+    try:
+        manager.update_score("animals", "EASY", 80.0, 2)
+        assert wait_until(journal.exists)
+        assert not scores.exists()
+        manager.update_score("animals", "HARD", 70.0, 1)
+        manager.update_score("colors", "EASY", 90.0, 5)
+        assert wait_until(lambda: not journal.exists())
+        assert json.loads(scores.read_text()) == {
+            "animals_EASY": {"accuracy": 80.0, "perfect_words": 2},
+            "animals_HARD": {"accuracy": 70.0, "perfect_words": 1},
+            "colors_EASY": {"accuracy": 90.0, "perfect_words": 5},
+        }
+    finally:
+        manager.close()
+    assert not os.path.exists(str(scores) + ".tmp")
+
+
+def test_close_flushes_pending_records(tmp_path):
+    scores = tmp_path / "scores.json"
+    manager = ScoreManager(str(scores))
+    manager.update_score("animals", "EASY", 80.0, 2)
+    assert not manager.update_score("animals", "EASY", 70.0, 9)
+    manager.close()
+    reopened = ScoreManager(str(scores))
+    try:
+        assert reopened.scores == {"animals_EASY": {"accuracy": 80.0, "perfect_words": 2}}
+    finally:
+        reopened.close()
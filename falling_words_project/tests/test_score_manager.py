@@ -0,0 +1,40 @@
+import gc
+import weakref
+
+from falling_words.score_manager import ScoreManager
+
+
+def test_sqlite_sessions_never_reach_the_journal_when_the_store_fails(tmp_path):
+    scores = tmp_path / "scores.json"
+    # A directory cannot be opened as a database.
+    manager = ScoreManager(str(scores), storage="sqlite", db_filename=str(tmp_path))
+    assert manager.scores == {}
+    assert manager.update_score("animals", "EASY", 90.0, 3, duration=12.0)
+    manager.close()
+    assert not (tmp_path / "scores.json.journal").exists()
+    assert not scores.exists()
+
+
+def test_sqlite_records_every_session(tmp_path):
+    manager = ScoreManager(str(tmp_path / "scores.json"), storage="sqlite",
+                           db_filename=str(tmp_path / "sessions.db"))
+    manager.update_score("animals", "EASY", 90.0, 3, duration=12.0)
+    manager.update_score("animals", "EASY", 80.0, 5, duration=10.0)
+    manager.close()
+
+    reopened = ScoreManager(str(tmp_path / "scores.json"), storage="sqlite",
+                            db_filename=str(tmp_path / "sessions.db"))
+    try:
+        assert reopened.scores == {"animals_EASY": {"accuracy": 90.0, "perfect_words": 3}}
+    finally:
+        reopened.close()
+    assert not (tmp_path / "scores.json.journal").exists()
+
+
+def test_closed_manager_can_be_collected(tmp_path):
+    manager = ScoreManager(str(tmp_path / "scores.json"))
+    manager.close()
+    ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from falling_words.simulation import Simulation
+
+WORDS = ["cat", "tiger", "otter", "elephant", "ox", "giraffe", "mouse", "hippopotamus"]
+
+
+class FixedWords:
+    """Stands in for WordManager: one level, its own seeded generator."""
+
+    current_level = "test"
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def get_word(self):
+        return self.rng.choice(WORDS)
+
+
+def play(seed, ticks=4000):
+    """A scripted typist: every 40 ticks, type the lowest word on screen."""
+    sim = Simulation(FixedWords(seed), 900, 650, rng=random.Random(seed + 1))
+    events = []
+    for tick in range(ticks):
+        if tick % 40 == 0 and len(sim.words) and not sim.finished:
+            word = max(sim.words, key=lambda w: (w.y, w.text))
+            if tick % 200 == 0:
+                sim.type_text("q")
+                sim.press_backspace()
+                sim.release_backspace()
+            sim.type_text(word.text)
+            sim.submit()
+        sim.run(1)
+        events.extend(sim.drain_events())
+    return sim, events
+
+
+def test_seeded_run_is_deterministic():
+    first, first_events = play(7)
+    second, second_events = play(7)
+    assert first_events == second_events
+    assert (first.score, first.total_missed, first.perfect_words) == (
+        second.score, second.total_missed, second.perfect_words)
+
+
+def test_seeded_run_gives_a_fixed_result():
+    sim, events = play(7)
+    assert sim.victory
+    assert (sim.score, sim.total_missed, sim.perfect_words, sim.words_typed) == (31, 0, 13, 18)
+    assert events.count("correct") == sim.words_typed
+
+
+def test_run_without_input_misses_words():
+    sim = Simulation(FixedWords(3), 900, 650, rng=random.Random(4))
+    sim.run(3000)
+    assert sim.score == 0
+    assert sim.total_missed > 0
+    assert not sim.victory
+
+
+def test_submit_reports_the_cleared_word():
+    sim = Simulation(FixedWords(1), 900, 650, rng=random.Random(2))
+    sim.run(30)
+    text = next(iter(sim.words)).text
+    sim.type_text(text)
+    length, on_screen_ms = sim.submit()
+    assert length == len(text)
+    assert on_screen_ms == pytest.approx(30 * 1000 / 60)
+    sim.type_text("zzz")
+    assert sim.submit() is None
@@ -0,0 +1,73 @@
+import time
+
+from falling_words.telemetry import (
+    BACKSPACE, END, FILE_SUFFIX, HIT, KEY, MISS, KeystrokeTelemetry, read_session, summarize_session,
+)
+
+
+def type_word(telemetry, word, typo=False):
+    if typo:
+        telemetry.record(KEY, ord("x"))
+        telemetry.record(BACKSPACE)
+    for ch in word:
+        telemetry.record(KEY, ord(ch))
+    telemetry.record(HIT, len(word), 1500)
+
+
+def test_sessions_round_trip_through_the_ring(tmp_path):
+    # A small ring, so the second session's records wrap around it.
+    telemetry = KeystrokeTelemetry(str(tmp_path), player="ada", capacity=64)
+    telemetry.start_session("animals", "EASY")
+    for i, word in enumerate(["otter", "tiger", "giraffe", "elephant"]):
+        type_word(telemetry, word, typo=i % 2 == 1)
+    telemetry.record(END, 120, 3)
+    # Let the flusher write the first session before the second laps its slots.
+    deadline = time.monotonic() + 10
+    while telemetry.flushed < telemetry.head and time.monotonic() < deadline:
+        time.sleep(0.05)
+    telemetry.start_session("programming", "HARD")
+    for word in ["lambda", "closure", "iterator", "generator"]:
+        type_word(telemetry, word)
+    telemetry.record(MISS, 4)
+    telemetry.record(END, 310, 0)
+    telemetry.close()
+    assert telemetry.head > telemetry.capacity
+    assert telemetry.dropped == 0
+
+    paths = sorted(tmp_path.glob("*" + FILE_SUFFIX))
+    assert len(paths) == 2
+    headers = {}
+    for path in paths:
+        header, columns = read_session(str(path))
+        headers[header["level"]] = header, columns
+    header, columns = headers["animals"]
+    assert header["player"] == "ada" and header["difficulty"] == "EASY"
+    assert len(columns["kind"]) == 34
+    assert columns["kind"][:3].tolist() == [KEY, KEY, KEY]
+    assert columns["value"][:5].tolist() == [ord(ch) for ch in "otter"]
+    assert list(columns["time"]) == sorted(columns["time"])
+
+    summaries = {summary["level"]: summary for summary in map(summarize_session, map(str, paths))}
+    animals = summaries["animals"]
+    assert animals["hits"] == 4
+    assert animals["word_chars"] == len("ottertigergiraffeelephant")
+    assert animals["on_screen_ms"] == 4 * 1500
+    assert animals["backspaces"] == animals["bursts"] == 2
+    assert animals["longest_burst"] == 1
+    assert (animals["score"], animals["missed"]) == (120, 3)
+    programming = summaries["programming"]
+    assert programming["hits"] == 4 and programming["misses"] == 1
+    assert programming["keys"] == len("lambdaclosureiteratorgenerator") + 5
+    assert (programming["score"], programming["missed"]) == (310, 0)
+
+
+def test_a_lapped_ring_drops_the_oldest_records(tmp_path):
+    telemetry = KeystrokeTelemetry(str(tmp_path), capacity=16)
+    telemetry.start_session("animals", "EASY")
+    for i in range(40):
+        telemetry.record(KEY, ord("a") + i % 26)
+    telemetry.close()
+    assert telemetry.dropped == 24
+    (path,) = tmp_path.glob("*" + FILE_SUFFIX)
+    _, columns = read_session(str(path))
+    assert columns["value"].tolist() == [ord("a") + i % 26 for i in range(24, 40)]
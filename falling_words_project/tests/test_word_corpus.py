@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from falling_words import word_corpus
+from falling_words.word_corpus import WordCorpus, build_corpus, load_corpus
+
+LEVELS = {
+    "animals": ["otter", "ox", "elephant", "cat", "tiger", "hippopotamus", "emu"],
+    "colors": ["red", "green", "blue"],
+}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    config = tmp_path / "words.json"
+    config.write_text(json.dumps({"default_level": "colors", "levels": LEVELS}))
+    corpus = load_corpus(str(config))
+    yield corpus
+    corpus.close()
+
+
+def test_levels_hold_their_words_sorted_by_length(corpus):
+    assert corpus.level_names == ["animals", "colors"]
+    assert corpus.default_level == "colors"
+    animals = corpus.level("animals")
+    assert len(animals) == len(LEVELS["animals"])
+    assert list(animals) == sorted(LEVELS["animals"], key=len)
+    assert animals[0] == "ox"
+    assert animals[-1] == "hippopotamus"
+    assert animals[1:3] == ["cat", "emu"]
+    with pytest.raises(IndexError):
+        animals[len(animals)]
+    assert list(corpus.level("colors")) == ["red", "blue", "green"]
+
+
+def test_length_range_selects_whole_lengths(corpus):
+    def words(min_length=None, max_length=None):
+        start, end = corpus.length_range("colors", min_length, max_length)
+        return {corpus.word(i) for i in range(start, end)}
+
+    assert words() == {"red", "blue", "green"}
+    assert words(4) == {"blue", "green"}
+    assert words(max_length=4) == {"red", "blue"}
+    assert words(4, 4) == {"blue"}
+    assert words(6) == set()
+    assert words(max_length=2) == set()
+    start, end = corpus.length_range("animals", 5, 8)
+    assert [corpus.word(i) for i in range(start, end)] == ["otter", "tiger", "elephant"]
+
+
+def test_load_corpus_reuses_or_rebuilds_the_compiled_file(tmp_path):
+    config = tmp_path / "words.json"
+    config.write_text(json.dumps({"levels": LEVELS}))
+    build_corpus(str(config), str(tmp_path / "words.corpus"))
+    config.write_text(json.dumps({"levels": {"colors": ["red"]}}))
+    corpus = load_corpus(str(config))
+    try:
+        assert corpus.level_names == ["colors"]
+    finally:
+        corpus.close()
+
+
+def test_load_corpus_closes_the_corpus_when_the_source_is_gone(tmp_path, monkeypatch):
+    config = tmp_path / "words.json"
+    config.write_text(json.dumps({"levels": LEVELS}))
+    load_corpus(str(config)).close()
+    config.unlink()
+    opened = []
+
+    class Tracked(WordCorpus):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(word_corpus, "WordCorpus", Tracked)
+    with pytest.raises(FileNotFoundError):
+        load_corpus(str(config))
+    assert len(opened) == 1
+    assert opened[0].map.closed and opened[0].file.closed
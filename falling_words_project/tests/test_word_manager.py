@@ -0,0 +1,61 @@
+import json
+import os
+import time
+
+from loguru import logger
+
+from falling_words.word_manager import WordManager
+
+
+def write_config(path, text):
+    path.write_text(text)
+    # A new signature even if the filesystem's mtime is coarse.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def wait_until(condition, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_json_levels_pick_words_within_the_length_range(tmp_path):
+    config = tmp_path / "words.json"
+    words = ["ox", "cat", "otter", "tiger", "giraffe", "elephant", "hippopotamus"]
+    config.write_text(json.dumps({"default_level": "animals", "levels": {"animals": words}}))
+    manager = WordManager(str(config), use_corpus=False)
+    assert manager.corpus is None
+    manager.rng.seed(5)
+    picked = {manager.get_word(min_length=5, max_length=8) for _ in range(200)}
+    assert picked == {"otter", "tiger", "giraffe", "elephant"}
+    assert {manager.get_word(max_length=3) for _ in range(50)} == {"ox", "cat"}
+    assert manager.get_word(min_length=20) in words
+
+
+def test_reload_keeps_the_old_words_when_the_config_is_broken(tmp_path):
+    config = tmp_path / "words.json"
+    config.write_text(json.dumps({"default_level": "animals", "levels": {"animals": ["cat", "dog"]}}))
+    manager = WordManager(str(config))
+    errors = []
+    sink = logger.add(errors.append, level="ERROR")
+    try:
+        manager.start_watching(interval=0.05)
+        write_config(config, '{"levels": {"animals": ["cat", ')
+        assert wait_until(lambda: errors)
+        assert not manager.apply_reload()
+        assert list(manager.levels["animals"]) == ["cat", "dog"]
+        assert manager.get_word() in ("cat", "dog")
+
+        write_config(config, json.dumps({"levels": {"birds": ["owl", "wren"]}}))
+        assert wait_until(manager.apply_reload)
+        assert manager.level_names == ["birds"]
+        assert manager.current_level == "birds"
+        assert manager.get_word() in ("owl", "wren")
+    finally:
+        logger.remove(sink)
+        manager.close()
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,50 @@
+import random
+
+from falling_words.simulation import Word
+from falling_words.word_matcher import WordMatcher
+
+
+def linear_highlighted(words, typed):
+    # The scan the matcher replaced.
+    if not typed:
+        return set()
+    return {word for word in words if word.text.lower().startswith(typed.lower())}
+
+
+def linear_match(words, typed):
+    for word in words:
+        if word.text.lower() == typed.lower():
+            return word
+    return None
+
+
+def test_matcher_agrees_with_linear_scan():
+    rng = random.Random(1)
+    # A tiny alphabet so words share prefixes and repeat.
+    vocabulary = ["".join(rng.choice("abC") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+    matcher = WordMatcher()
+    words = []
+    typed = ""
+    for step in range(5000):
+        action = rng.random()
+        if action < 0.2 and len(words) < 12:
+            word = Word(0, 0, rng.choice(vocabulary), 1.0)
+            words.append(word)
+            matcher.add(word)
+        elif action < 0.35 and words:
+            word = words.pop(rng.randrange(len(words)))
+            matcher.remove(word)
+        elif action < 0.75:
+            ch = rng.choice("abcAB")
+            typed += ch
+            matcher.push(ch)
+        elif action < 0.92:
+            typed = typed[:-1]
+            matcher.pop()
+        else:
+            typed = ""
+            matcher.clear_input()
+
+        assert matcher.input == typed
+        assert set(matcher.highlighted) == linear_highlighted(words, typed), step
+        assert matcher.match() is linear_match(words, typed), step